@@ -1,37 +1,161 @@
 """Bridge between Agent and TUI."""
 
 import asyncio
+from collections import deque
 from collections.abc import AsyncIterator
+from dataclasses import dataclass
 
+from protocol.codec import encode_frame, encode_message
 from protocol.models import ChatMessage
 
+# Minimum number of consumed log entries before the log is compacted
+_COMPACT_THRESHOLD = 64
+
+
+@dataclass(slots=True, eq=False)
+class _Subscriber:
+    """Read position of a single subscriber."""
+
+    cursor: int
+
 
 class Bridge:
-    """Bridge that connects Agent and TUI through message queues."""
+    """Bridge that connects Agent and TUI through a shared message log."""
 
-    def __init__(self):
-        """Initialize bridge."""
-        self._message_queue: asyncio.Queue[ChatMessage] = asyncio.Queue()
-        self._subscribers: list[asyncio.Queue[ChatMessage]] = []
+    __slots__ = (
+        "_last_frame",
+        "_log",
+        "_log_offset",
+        "_max_backlog",
+        "_messages",
+        "_messages_ready",
+        "_payloads",
+        "_subscribers",
+        "_wakeup",
+        "dropped_messages",
+    )
+
+    def __init__(self, max_backlog: int = 1024):
+        """
+        Initialize bridge.
+
+        Args:
+            max_backlog: Maximum number of unread messages kept for a single
+                subscriber; older ones are dropped when it falls behind
+        """
+        self._max_backlog = max_backlog
+        # Number of messages dropped for subscribers that fell behind,
+        # counted when a lagging subscriber next reads
+        self.dropped_messages = 0
+        # Main queue for the legacy get_messages consumer, created on the
+        # first get_messages call so unused bridges do not retain messages
+        self._messages: deque[ChatMessage] | None = None
+        self._messages_ready = asyncio.Event()
+        # Broadcast log shared by all subscribers. ``_log_offset`` is the
+        # sequence number of ``_log[0]``; each subscriber keeps its own
+        # cursor into this sequence.
+        self._log: list[ChatMessage] = []
+        # Serialized form of each log entry, encoded on first request and
+        # shared by every payload subscriber
+        self._payloads: list[bytes | None] = []
+        # Most recently built wire frame and the log sequence range it
+        # covers; subscribers woken by the same send read the same range
+        self._last_frame: tuple[tuple[int, int], bytes] | None = None
+        self._log_offset = 0
+        self._subscribers: set[_Subscriber] = set()
+        # Signal shared by all subscribers waiting for new entries; created
+        # by the first waiter and replaced after each wakeup
+        self._wakeup: asyncio.Event | None = None
 
     async def send(self, message: ChatMessage) -> None:
         """
         Send a chat message to all subscribers.
 
+        The message is appended to the shared log once and waiting
+        subscribers are woken through a single shared event, so the cost
+        does not depend on the number of subscribers. A subscriber that
+        falls more than max_backlog messages behind skips the oldest ones
+        when it next reads.
+
         Args:
             message: Chat message to send
         """
-        # Add to main queue
-        await self._message_queue.put(message)
+        # Add to main queue if the legacy consumer is in use
+        if self._messages is not None:
+            self._messages.append(message)
+            self._messages_ready.set()
 
-        # Broadcast to all subscribers
-        for subscriber_queue in self._subscribers:
-            try:
-                await subscriber_queue.put(message)
-            except Exception:
-                # Remove dead subscribers
-                if subscriber_queue in self._subscribers:
-                    self._subscribers.remove(subscriber_queue)
+        if not self._subscribers:
+            return
+
+        self._log.append(message)
+        self._payloads.append(None)
+        wakeup = self._wakeup
+        if wakeup is not None:
+            self._wakeup = None
+            wakeup.set()
+
+        if len(self._log) >= 2 * _COMPACT_THRESHOLD:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop log entries no subscriber will read anymore."""
+        end = self._log_offset + len(self._log)
+        low = min(
+            (subscriber.cursor for subscriber in self._subscribers),
+            default=end,
+        )
+        # Entries beyond max_backlog would be skipped by lagging readers
+        low = max(low, end - self._max_backlog)
+        consumed = low - self._log_offset
+        if consumed >= _COMPACT_THRESHOLD or not self._subscribers:
+            del self._log[:consumed]
+            del self._payloads[:consumed]
+            self._log_offset = low
+
+    def _register(self) -> _Subscriber:
+        """Register a subscriber positioned at the end of the log."""
+        subscriber = _Subscriber(cursor=self._log_offset + len(self._log))
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def _unregister(self, subscriber: _Subscriber) -> None:
+        """Remove a subscriber and release log entries it was holding."""
+        self._subscribers.discard(subscriber)
+        self._compact()
+
+    async def _wait_unread(self, subscriber: _Subscriber) -> int:
+        """Wait until the subscriber has unread entries; return the first."""
+        while True:
+            end = self._log_offset + len(self._log)
+            # Oldest allowed cursor; a lagging subscriber skips ahead to it
+            oldest = end - self._max_backlog
+            if subscriber.cursor < oldest:
+                self.dropped_messages += oldest - subscriber.cursor
+                subscriber.cursor = oldest
+            if subscriber.cursor < end:
+                return subscriber.cursor - self._log_offset
+            if self._wakeup is None:
+                self._wakeup = asyncio.Event()
+            await self._wakeup.wait()
+
+    def _payload(self, index: int) -> bytes:
+        """Return the serialized log entry, encoding it on first use."""
+        payload = self._payloads[index]
+        if payload is None:
+            payload = encode_message(self._log[index])
+            self._payloads[index] = payload
+        return payload
+
+    def _frame(self, start: int, end: int) -> bytes:
+        """Return the wire frame for log entries start to end (exclusive)."""
+        key = (self._log_offset + start, self._log_offset + end)
+        last_frame = self._last_frame
+        if last_frame is not None and last_frame[0] == key:
+            return last_frame[1]
+        frame = encode_frame([self._payload(i) for i in range(start, end)])
+        self._last_frame = (key, frame)
+        return frame
 
     def create_subscriber(
         self,
@@ -42,27 +166,93 @@ class Bridge:
         Yields:
             Chat messages as they arrive
         """
-        queue: asyncio.Queue[ChatMessage] = asyncio.Queue()
-        self._subscribers.append(queue)
+        subscriber = self._register()
 
         async def message_iterator() -> AsyncIterator[ChatMessage]:
             try:
                 while True:
-                    message = await queue.get()
-                    yield message
+                    index = await self._wait_unread(subscriber)
+                    subscriber.cursor += 1
+                    yield self._log[index]
             finally:
-                if queue in self._subscribers:
-                    self._subscribers.remove(queue)
+                self._unregister(subscriber)
 
         return message_iterator()
 
-    async def get_messages(self) -> AsyncIterator[ChatMessage]:
+    def create_payload_subscriber(
+        self,
+    ) -> AsyncIterator[list[bytes]]:
+        """
+        Create a new subscriber that yields serialized messages in batches.
+
+        Each batch holds every message that arrived since the previous one,
+        so a burst of sends can be forwarded together. Each message is
+        serialized to JSON once, no matter how many payload subscribers
+        receive it.
+
+        Yields:
+            Non-empty lists of JSON-encoded chat messages, in send order
+        """
+        subscriber = self._register()
+
+        async def payload_iterator() -> AsyncIterator[list[bytes]]:
+            try:
+                while True:
+                    start = await self._wait_unread(subscriber)
+                    end = len(self._log)
+                    subscriber.cursor += end - start
+                    yield [self._payload(i) for i in range(start, end)]
+            finally:
+                self._unregister(subscriber)
+
+        return payload_iterator()
+
+    def create_frame_subscriber(
+        self,
+    ) -> AsyncIterator[bytes]:
+        """
+        Create a new subscriber that yields ready-to-send wire frames.
+
+        Like create_payload_subscriber, but each batch is already combined
+        into a frame. Subscribers that read the same batch share a single
+        frame, so a broadcast is encoded once rather than per connection.
+
+        Yields:
+            Wire frames carrying every message since the previous one
+        """
+        subscriber = self._register()
+
+        async def frame_iterator() -> AsyncIterator[bytes]:
+            try:
+                while True:
+                    start = await self._wait_unread(subscriber)
+                    end = len(self._log)
+                    subscriber.cursor += end - start
+                    yield self._frame(start, end)
+            finally:
+                self._unregister(subscriber)
+
+        return frame_iterator()
+
+    def get_messages(self) -> AsyncIterator[ChatMessage]:
         """
         Get chat messages as they arrive (legacy method).
 
+        The main queue is created on the first call, so only messages sent
+        after that call are delivered.
+
         Yields:
             Chat messages
         """
-        while True:
-            message = await self._message_queue.get()
-            yield message
+        if self._messages is None:
+            self._messages = deque(maxlen=self._max_backlog)
+        messages = self._messages
+
+        async def message_iterator() -> AsyncIterator[ChatMessage]:
+            while True:
+                while not messages:
+                    self._messages_ready.clear()
+                    await self._messages_ready.wait()
+                yield messages.popleft()
+
+        return message_iterator()
@@ -1,106 +1,136 @@
 """Adapter client for sending and receiving chat messages."""
 
 import asyncio
-import json
+from collections import deque
 from collections.abc import AsyncIterator
 
 import websockets
+from pydantic import ValidationError
 from websockets.client import WebSocketClientProtocol
 
+from protocol.codec import decode_frame, encode_message
 from protocol.models import ChatMessage
 
 
 class AdapterClient:
     """Simple adapter client for sending and receiving messages."""
 
-    def __init__(self, uri: str):
+    __slots__ = (
+        "_connected",
+        "_messages_ready",
+        "_pending",
+        "_reader",
+        "_websocket",
+        "uri",
+    )
+
+    def __init__(self, uri: str, max_backlog: int = 1024):
         """
         Initialize adapter client.
 
         Args:
             uri: WebSocket server URI
+            max_backlog: Maximum number of received messages kept until
+                they are read; older ones are dropped when receive falls
+                behind
         """
         self.uri = uri
         self._websocket: WebSocketClientProtocol | None = None
         self._connected = False
-        self._receive_queue: asyncio.Queue[ChatMessage] = asyncio.Queue()
-        self._receive_task: asyncio.Task | None = None
+        # Messages read from the connection but not yet yielded by receive
+        self._pending: deque[ChatMessage] = deque(maxlen=max_backlog)
+        self._messages_ready = asyncio.Event()
+        # Task reading frames into _pending while connected
+        self._reader: asyncio.Task[None] | None = None
 
     async def connect(self) -> None:
         """Connect to WebSocket server."""
         if not self._connected:
-            try:
-                # Use longer timeout for connection
-                self._websocket = await asyncio.wait_for(
-                    websockets.connect(self.uri), timeout=10.0
-                )
-                self._connected = True
-                # Start receiving messages in background
-                self._receive_task = asyncio.create_task(self._receive_loop())
-            except asyncio.TimeoutError as e:
-                raise
-            except Exception as e:
-                raise
+            # Use longer timeout for connection. Messages are small JSON
+            # objects, so per-message deflate would cost more CPU than the
+            # bandwidth it saves.
+            self._websocket = await asyncio.wait_for(
+                websockets.connect(self.uri, compression=None), timeout=10.0
+            )
+            self._connected = True
+            self._reader = asyncio.create_task(self._read_frames())
 
     async def disconnect(self) -> None:
         """Disconnect from WebSocket server."""
-        if self._receive_task:
-            self._receive_task.cancel()
+        if self._reader:
+            self._reader.cancel()
             try:
-                await self._receive_task
+                await self._reader
             except asyncio.CancelledError:
                 pass
-            self._receive_task = None
+            self._reader = None
 
         if self._websocket:
             await self._websocket.close()
             self._connected = False
             self._websocket = None
 
-    async def _receive_loop(self) -> None:
-        """Background task to receive messages."""
-        if not self._websocket:
-            return
-
-        try:
-            async for message in self._websocket:
-                try:
-                    chat_message = ChatMessage.model_validate_json(message)
-                    await self._receive_queue.put(chat_message)
-                except Exception:
-                    pass  # Ignore invalid messages
-        except Exception as e:
-            pass  # Connection closed
-
     async def send(self, message: ChatMessage) -> None:
         """
         Send a chat message.
 
         Args:
             message: Chat message to send
+
+        Raises:
+            websockets.ConnectionClosed: If the connection is closed
         """
         if not self._connected:
             await self.connect()
 
         if self._websocket:
-            json_data = message.model_dump_json()
-            await self._websocket.send(json_data)
+            # Bytes go out as a binary frame, avoiding a str round trip
+            await self._websocket.send(encode_message(message))
+
+    async def _read_frames(self) -> None:
+        """Read frames into the pending messages until the connection ends."""
+        # The connection is read even while nobody iterates receive (the
+        # server also echoes a client's own messages back to it). Once
+        # unread frames pile up, websockets stops reading the socket, so
+        # keepalive pongs go unseen and the connection is failed.
+        recv = self._websocket.recv
+        pending = self._pending
+        try:
+            while True:
+                frame = await recv()
+                try:
+                    messages = decode_frame(frame)
+                except ValidationError:
+                    continue  # Ignore invalid messages
+                pending.extend(messages)
+                self._messages_ready.set()
+        except websockets.ConnectionClosed:
+            pass  # Connection closed
+        finally:
+            # Wake receive so it sees the reader has stopped
+            self._messages_ready.set()
 
     async def receive(self) -> AsyncIterator[ChatMessage]:
         """
         Receive chat messages.
 
+        Frames are read by a background task from connect on, and up to
+        max_backlog messages wait here until the caller iterates; beyond
+        that the oldest are dropped. Connects first if not connected yet.
+
         Yields:
-            Chat messages as they arrive
+            Chat messages as they arrive, until the connection closes
         """
         if not self._connected:
             await self.connect()
 
+        pending = self._pending
+        ready = self._messages_ready
+        reader = self._reader
         while True:
-            try:
-                message = await self._receive_queue.get()
-                yield message
-            except asyncio.CancelledError:
-                break
-            except Exception:
-                break
+            while pending:
+                yield pending.popleft()
+            if reader is None or reader.done():
+                return  # Connection closed
+            ready.clear()
+            await ready.wait()
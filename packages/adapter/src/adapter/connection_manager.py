@@ -1,7 +1,7 @@
 """Connection manager for WebSocket connections."""
 
-from collections.abc import AsyncIterator
-from typing import Any
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
 
 from fastapi import WebSocket
 
@@ -9,9 +9,21 @@ from fastapi import WebSocket
 class ConnectionManager:
     """Manages WebSocket connections."""
 
-    def __init__(self):
-        """Initialize connection manager."""
-        self.active_connections: list[WebSocket] = []
+    __slots__ = ("_snapshot", "active_connections", "send_timeout")
+
+    def __init__(self, send_timeout: float | None = 5.0):
+        """
+        Initialize connection manager.
+
+        Args:
+            send_timeout: Seconds a broadcast waits for a single connection
+                before dropping it (None waits indefinitely)
+        """
+        self.active_connections: set[WebSocket] = set()
+        self.send_timeout = send_timeout
+        # Immutable view of active_connections for broadcasts, rebuilt only
+        # when a connection is added or removed
+        self._snapshot: tuple[WebSocket, ...] = ()
 
     async def connect(self, websocket: WebSocket) -> None:
         """
@@ -21,7 +33,8 @@ class ConnectionManager:
             websocket: WebSocket connection to register
         """
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        self._snapshot = tuple(self.active_connections)
 
     def disconnect(self, websocket: WebSocket) -> None:
         """
@@ -30,8 +43,13 @@ class ConnectionManager:
         Args:
             websocket: WebSocket connection to unregister
         """
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        connections = self.active_connections
+        count = len(connections)
+        connections.discard(websocket)
+        # Already-removed connections (e.g. dropped by a failed broadcast)
+        # leave the snapshot untouched
+        if len(connections) != count:
+            self._snapshot = tuple(connections)
 
     async def send_personal_message(
         self, message: str, websocket: WebSocket
@@ -45,6 +63,18 @@ class ConnectionManager:
         """
         await websocket.send_text(message)
 
+    async def send_personal_bytes(
+        self, payload: bytes, websocket: WebSocket
+    ) -> None:
+        """
+        Send an already encoded payload to a specific WebSocket connection.
+
+        Args:
+            payload: Encoded message to send as a binary frame
+            websocket: Target WebSocket connection
+        """
+        await websocket.send_bytes(payload)
+
     async def broadcast(self, message: str) -> None:
         """
         Broadcast a message to all active connections.
@@ -52,31 +82,81 @@ class ConnectionManager:
         Args:
             message: Message to broadcast
         """
-        disconnected = []
-        for connection in self.active_connections:
+        await self._send_to_all(
+            lambda connection: connection.send_text(message)
+        )
+
+    async def broadcast_bytes(self, payload: bytes) -> None:
+        """
+        Broadcast an already encoded payload to all active connections.
+
+        The payload is sent as-is, so callers can encode a message once and
+        reuse it for every connection.
+
+        Args:
+            payload: Encoded message to send as a binary frame
+        """
+        await self._send_to_all(
+            lambda connection: connection.send_bytes(payload)
+        )
+
+    async def _send_to_all(
+        self, send: Callable[[WebSocket], Awaitable[None]]
+    ) -> None:
+        """
+        Run a send on every active connection concurrently.
+
+        A slow connection does not delay the others; connections that fail
+        or exceed the send timeout are disconnected.
+
+        Args:
+            send: Function that sends to a single connection
+        """
+        # Connections may change while the sends are in flight; the
+        # snapshot taken here stays valid
+        connections = self._snapshot
+        if len(connections) == 1:
+            # Nothing to overlap with; await the send without a gather task
+            connection = connections[0]
             try:
-                await connection.send_text(message)
+                await asyncio.wait_for(send(connection), self.send_timeout)
             except Exception:
-                disconnected.append(connection)
+                self.disconnect(connection)
+            return
 
-        for connection in disconnected:
-            self.disconnect(connection)
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(send(connection), self.send_timeout)
+                for connection in connections
+            ),
+            return_exceptions=True,
+        )
+
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection)
 
     async def receive_messages(
         self, websocket: WebSocket
-    ) -> AsyncIterator[str]:
+    ) -> AsyncIterator[str | bytes]:
         """
         Receive messages from a WebSocket connection.
 
+        Binary frames are yielded as raw bytes, skipping a UTF-8 decode;
+        text frames are yielded as str.
+
         Args:
             websocket: WebSocket connection to receive from
 
         Yields:
-            Received messages as text
+            Received message payloads
         """
         while True:
             try:
-                data = await websocket.receive_text()
-                yield data
+                message = await websocket.receive()
             except Exception:
                 break
+            if message["type"] == "websocket.disconnect":
+                break
+            data = message.get("bytes")
+            yield data if data is not None else message["text"]
@@ -1,13 +1,89 @@
 """FastAPI WebSocket server for adapter."""
 
 import asyncio
+from contextlib import aclosing
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import ValidationError
 
 from .bridge import Bridge
 from .connection_manager import ConnectionManager
-from protocol.models import ChatMessage
+from protocol.codec import decode_frame
+
+
+async def _receive_from_client(
+    websocket: WebSocket,
+    bridge: Bridge,
+    manager: ConnectionManager,
+    sender: asyncio.Task[None],
+) -> None:
+    """
+    Forward messages sent by a client to the bridge.
+
+    Args:
+        websocket: Client WebSocket connection
+        bridge: Bridge to publish messages on
+        manager: Connection manager owning the connection
+        sender: Task forwarding bridge messages to the same client
+    """
+    try:
+        async for message in manager.receive_messages(websocket):
+            try:
+                chat_messages = decode_frame(message)
+            except ValidationError:
+                continue  # Ignore invalid messages
+            for chat_message in chat_messages:
+                await bridge.send(chat_message)
+    finally:
+        # Client stopped sending; stop forwarding bridge messages to it
+        sender.cancel()
+
+
+async def _send_to_client(
+    websocket: WebSocket, bridge: Bridge, manager: ConnectionManager
+) -> None:
+    """
+    Forward bridge messages to a client.
+
+    Args:
+        websocket: Client WebSocket connection
+        bridge: Bridge to subscribe to
+        manager: Connection manager owning the connection
+    """
+    async with aclosing(bridge.create_frame_subscriber()) as frames:
+        # Messages that piled up during the previous send share a frame,
+        # and clients reading the same messages share its encoding
+        async for frame in frames:
+            await manager.send_personal_bytes(frame, websocket)
+
+
+async def _serve_connection(
+    websocket: WebSocket, bridge: Bridge, manager: ConnectionManager
+) -> None:
+    """
+    Relay messages between a client and the bridge until it disconnects.
+
+    Bridge messages are forwarded by a task in a task group while the
+    calling task reads from the client; when either side stops the other
+    is cancelled and no task outlives the connection.
+
+    Args:
+        websocket: Client WebSocket connection
+        bridge: Bridge shared by all clients
+        manager: Connection manager owning the connection
+    """
+    await manager.connect(websocket)
+    try:
+        async with asyncio.TaskGroup() as tg:
+            sender = tg.create_task(_send_to_client(websocket, bridge, manager))
+            # Inbound frames are read on the endpoint's own task, so each
+            # connection costs a single extra task
+            await _receive_from_client(websocket, bridge, manager, sender)
+    except* WebSocketDisconnect:
+        pass
+    finally:
+        manager.disconnect(websocket)
 
 
 def create_app(bridge: Bridge | None = None) -> FastAPI:
@@ -45,29 +121,7 @@ def create_app(bridge: Bridge | None = None) -> FastAPI:
         Args:
             websocket: WebSocket connection
         """
-        await manager.connect(websocket)
-        try:
-            # Agent sends messages
-            async def receive_from_agent():
-                async for message in manager.receive_messages(websocket):
-                    try:
-                        chat_message = ChatMessage.model_validate_json(message)
-                        await bridge.send(chat_message)
-                    except Exception:
-                        pass  # Ignore invalid messages
-
-            # Agent receives messages
-            async def send_to_agent():
-                async for message in bridge.create_subscriber():
-                    json_data = message.model_dump_json()
-                    await manager.send_personal_message(json_data, websocket)
-
-            await asyncio.gather(
-                receive_from_agent(),
-                send_to_agent(),
-            )
-        except WebSocketDisconnect:
-            manager.disconnect(websocket)
+        await _serve_connection(websocket, bridge, manager)
 
     @app.websocket("/ws/tui")
     async def websocket_tui(websocket: WebSocket) -> None:
@@ -79,28 +133,6 @@ def create_app(bridge: Bridge | None = None) -> FastAPI:
         Args:
             websocket: WebSocket connection
         """
-        await manager.connect(websocket)
-        try:
-            # TUI receives messages from Agent
-            async def send_to_tui():
-                async for message in bridge.create_subscriber():
-                    json_data = message.model_dump_json()
-                    await manager.send_personal_message(json_data, websocket)
-
-            # TUI sends messages to Agent
-            async def receive_from_tui():
-                async for message in manager.receive_messages(websocket):
-                    try:
-                        chat_message = ChatMessage.model_validate_json(message)
-                        await bridge.send(chat_message)
-                    except Exception:
-                        pass  # Ignore invalid messages
-
-            await asyncio.gather(
-                send_to_tui(),
-                receive_from_tui(),
-            )
-        except WebSocketDisconnect:
-            manager.disconnect(websocket)
+        await _serve_connection(websocket, bridge, manager)
 
     return app
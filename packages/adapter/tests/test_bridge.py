@@ -1,8 +1,11 @@
 """Tests for bridge module."""
 
+import asyncio
+
 import pytest
 
 from adapter.bridge import Bridge
+from protocol.codec import decode_frame
 from protocol.models import ChatMessage
 
 
@@ -11,11 +14,12 @@ async def test_bridge_send_makes_message_available_via_get_messages():
     """Test bridge send makes messages available via get_messages."""
     bridge = Bridge()
     message = ChatMessage(role="user", content="Hello")
+    messages = bridge.get_messages()
 
     await bridge.send(message)
 
     # Verify message is available through public API
-    received_message = await anext(bridge.get_messages())
+    received_message = await anext(messages)
     assert received_message.role == "user"
     assert received_message.content == "Hello"
 
@@ -59,14 +63,164 @@ async def test_bridge_multiple_subscribers():
     assert msg2.content == "Test message"
 
 
+@pytest.mark.asyncio
+async def test_bridge_send_wakes_all_waiting_subscribers():
+    """Test one send wakes every subscriber already waiting for messages."""
+    bridge = Bridge()
+    subscribers = [bridge.create_subscriber() for _ in range(3)]
+    waiting = [asyncio.create_task(anext(sub)) for sub in subscribers]
+    await asyncio.sleep(0)
+
+    await bridge.send(ChatMessage(role="user", content="Wake up"))
+    received = await asyncio.wait_for(asyncio.gather(*waiting), timeout=1.0)
+
+    assert [msg.content for msg in received] == ["Wake up"] * 3
+
+
+@pytest.mark.asyncio
+async def test_bridge_send_reaches_hundreds_of_waiting_subscribers():
+    """Test a burst of sends reaches every one of many waiting subscribers."""
+    bridge = Bridge()
+    subscribers = [bridge.create_subscriber() for _ in range(300)]
+
+    async def read_two(subscriber):
+        return [(await anext(subscriber)).content for _ in range(2)]
+
+    readers = [asyncio.create_task(read_two(sub)) for sub in subscribers]
+    await asyncio.sleep(0)
+
+    await bridge.send(ChatMessage(role="user", content="first"))
+    await bridge.send(ChatMessage(role="user", content="second"))
+    received = await asyncio.wait_for(asyncio.gather(*readers), timeout=1.0)
+
+    assert received == [["first", "second"]] * 300
+
+
 @pytest.mark.asyncio
 async def test_bridge_get_messages_returns_sent_messages():
     """Test bridge get_messages returns messages sent via send."""
     bridge = Bridge()
     message = ChatMessage(role="system", content="System message")
+    messages = bridge.get_messages()
 
     await bridge.send(message)
 
     # Get messages
-    received_message = await anext(bridge.get_messages())
+    received_message = await anext(messages)
     assert received_message.content == "System message"
+
+
+@pytest.mark.asyncio
+async def test_bridge_slow_subscriber_receives_all_messages_in_order():
+    """Test slow subscriber still receives every message after log reuse."""
+    bridge = Bridge()
+    fast = bridge.create_subscriber()
+    slow = bridge.create_subscriber()
+
+    # Fast subscriber drains as messages arrive, slow one lags behind
+    for i in range(300):
+        await bridge.send(ChatMessage(role="user", content=str(i)))
+        assert (await anext(fast)).content == str(i)
+
+    received = [(await anext(slow)).content for _ in range(300)]
+    assert received == [str(i) for i in range(300)]
+
+
+@pytest.mark.asyncio
+async def test_bridge_payload_subscribers_receive_same_serialized_message():
+    """Test payload subscribers share one JSON encoding of each message."""
+    bridge = Bridge()
+    subscriber1 = bridge.create_payload_subscriber()
+    subscriber2 = bridge.create_payload_subscriber()
+
+    await bridge.send(ChatMessage(role="user", content="Encoded"))
+
+    [payload1] = await anext(subscriber1)
+    [payload2] = await anext(subscriber2)
+
+    assert payload1 is payload2
+    assert ChatMessage.model_validate_json(payload1).content == "Encoded"
+
+
+@pytest.mark.asyncio
+async def test_bridge_payload_subscriber_batches_messages_since_last_read():
+    """Test payload subscriber yields every pending message in one batch."""
+    bridge = Bridge()
+    subscriber = bridge.create_payload_subscriber()
+
+    await bridge.send(ChatMessage(role="user", content="first"))
+    first_batch = await anext(subscriber)
+    await bridge.send(ChatMessage(role="assistant", content="second"))
+    await bridge.send(ChatMessage(role="assistant", content="third"))
+    second_batch = await anext(subscriber)
+
+    contents = [
+        [ChatMessage.model_validate_json(p).content for p in batch]
+        for batch in (first_batch, second_batch)
+    ]
+    assert contents == [["first"], ["second", "third"]]
+
+
+@pytest.mark.asyncio
+async def test_bridge_frame_subscribers_share_frame_for_same_batch():
+    """Test frame subscribers reading the same batch get one shared frame."""
+    bridge = Bridge()
+    subscriber1 = bridge.create_frame_subscriber()
+    subscriber2 = bridge.create_frame_subscriber()
+
+    await bridge.send(ChatMessage(role="assistant", content="Hello"))
+    await bridge.send(ChatMessage(role="assistant", content="World"))
+
+    frame1 = await anext(subscriber1)
+    frame2 = await anext(subscriber2)
+
+    assert frame1 is frame2
+    assert [msg.content for msg in decode_frame(frame1)] == ["Hello", "World"]
+
+
+@pytest.mark.asyncio
+async def test_bridge_frame_subscribers_at_different_positions_get_own_frames():
+    """Test a frame subscriber that is behind gets the messages it missed."""
+    bridge = Bridge()
+    behind = bridge.create_frame_subscriber()
+    caught_up = bridge.create_frame_subscriber()
+
+    await bridge.send(ChatMessage(role="user", content="first"))
+    await anext(caught_up)
+    await bridge.send(ChatMessage(role="user", content="second"))
+
+    caught_up_frame = await anext(caught_up)
+    behind_frame = await anext(behind)
+
+    assert [m.content for m in decode_frame(caught_up_frame)] == ["second"]
+    assert [m.content for m in decode_frame(behind_frame)] == [
+        "first",
+        "second",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bridge_lagging_subscriber_drops_oldest_messages_beyond_backlog():
+    """Test subscriber past max_backlog keeps only the newest messages."""
+    bridge = Bridge(max_backlog=2)
+    subscriber = bridge.create_subscriber()
+
+    for i in range(5):
+        await bridge.send(ChatMessage(role="user", content=str(i)))
+
+    received = [(await anext(subscriber)).content for _ in range(2)]
+    assert received == ["3", "4"]
+    assert bridge.dropped_messages == 3
+
+
+@pytest.mark.asyncio
+async def test_bridge_get_messages_skips_messages_sent_before_first_call():
+    """Test get_messages only delivers messages sent after it was called."""
+    bridge = Bridge()
+
+    await bridge.send(ChatMessage(role="user", content="Unobserved"))
+    messages = bridge.get_messages()
+    await bridge.send(ChatMessage(role="user", content="Observed"))
+
+    received_message = await anext(messages)
+    assert received_message.content == "Observed"
@@ -3,19 +3,33 @@
 import asyncio
 
 import pytest
+import websockets
 from unittest.mock import AsyncMock, MagicMock, patch
+from websockets.asyncio.server import serve
 
 from adapter.client import AdapterClient
+from protocol.codec import decode_frame, encode_frame, encode_message
 from protocol.models import ChatMessage
 
 
+def _idle_websocket() -> AsyncMock:
+    """Return a mocked connection whose recv waits like an idle socket."""
+    websocket = AsyncMock()
+
+    async def wait_forever():
+        await asyncio.Event().wait()
+
+    websocket.recv.side_effect = wait_forever
+    return websocket
+
+
 @pytest.mark.asyncio
 async def test_adapter_client_connects_to_websocket_server():
     """Test adapter client connects to WebSocket server."""
     client = AdapterClient("ws://localhost:8000/ws/agent")
 
     with patch("adapter.client.websockets.connect") as mock_connect:
-        mock_websocket = AsyncMock()
+        mock_websocket = _idle_websocket()
 
         # Make connect return an awaitable that returns the websocket
         async def connect_side_effect(*args, **kwargs):
@@ -26,20 +40,25 @@ async def test_adapter_client_connects_to_websocket_server():
         await client.connect()
 
         # Verify connection was attempted
-        mock_connect.assert_called_once_with("ws://localhost:8000/ws/agent")
+        mock_connect.assert_called_once_with(
+            "ws://localhost:8000/ws/agent", compression=None
+        )
         # Verify we can send messages (indirect verification of connection)
         message = ChatMessage(role="user", content="Test")
         await client.send(message)
         mock_websocket.send.assert_called()
 
+        await client.disconnect()
+
 
 @pytest.mark.asyncio
 async def test_adapter_client_disconnect_closes_connection():
     """Test adapter client disconnect closes WebSocket connection."""
     client = AdapterClient("ws://localhost:8000/ws/agent")
-    mock_websocket = AsyncMock()
+    mock_websocket = _idle_websocket()
 
     with patch("adapter.client.websockets.connect") as mock_connect:
+
         async def connect_side_effect(*args, **kwargs):
             return mock_websocket
 
@@ -47,13 +66,6 @@ async def test_adapter_client_disconnect_closes_connection():
 
         await client.connect()
 
-        # Create a real task that can be cancelled
-        async def dummy_task():
-            await asyncio.sleep(1)
-
-        # Access private member only to set up test state
-        client._receive_task = asyncio.create_task(dummy_task())
-
         await client.disconnect()
 
         # Verify websocket was closed
@@ -68,7 +80,7 @@ async def test_adapter_client_send_serializes_and_sends_message():
     client = AdapterClient("ws://localhost:8000/ws/agent")
 
     with patch("adapter.client.websockets.connect") as mock_connect:
-        mock_websocket = AsyncMock()
+        mock_websocket = _idle_websocket()
 
         async def connect_side_effect(*args, **kwargs):
             return mock_websocket
@@ -81,30 +93,57 @@ async def test_adapter_client_send_serializes_and_sends_message():
 
         # Verify message was sent
         mock_websocket.send.assert_called_once()
-        # Verify JSON was sent with correct content
+        # Verify JSON bytes were sent with correct content
         call_args = mock_websocket.send.call_args[0][0]
-        assert "Hello" in call_args
+        assert isinstance(call_args, bytes)
+        assert ChatMessage.model_validate_json(call_args).content == "Hello"
+
+        await client.disconnect()
 
 
 @pytest.mark.asyncio
-async def test_adapter_client_receive_yields_messages_from_queue():
-    """Test adapter client receive yields messages from receive queue."""
+async def test_adapter_client_send_raises_when_write_fails():
+    """Test a failed write reaches the sender and is not retried later."""
     client = AdapterClient("ws://localhost:8000/ws/agent")
 
     with patch("adapter.client.websockets.connect") as mock_connect:
-        mock_websocket = AsyncMock()
+        mock_websocket = _idle_websocket()
+        mock_websocket.send.side_effect = websockets.ConnectionClosed(
+            None, None
+        )
 
         async def connect_side_effect(*args, **kwargs):
             return mock_websocket
 
         mock_connect.side_effect = connect_side_effect
 
-        await client.connect()
+        with pytest.raises(websockets.ConnectionClosed):
+            await client.send(ChatMessage(role="assistant", content="a"))
+        await client.disconnect()
+
+    mock_websocket.send.assert_called_once()
+    mock_websocket.close.assert_called_once()
+
 
-        # Manually put a message in the queue to test receive()
+@pytest.mark.asyncio
+async def test_adapter_client_receive_yields_messages_from_websocket():
+    """Test adapter client receive decodes frames read from the websocket."""
+    client = AdapterClient("ws://localhost:8000/ws/agent")
+
+    with patch("adapter.client.websockets.connect") as mock_connect:
+        mock_websocket = AsyncMock()
         test_message = ChatMessage(role="assistant", content="Hi")
-        # Access private member only to set up test state
-        await client._receive_queue.put(test_message)
+        mock_websocket.recv.side_effect = [
+            test_message.model_dump_json(),
+            websockets.ConnectionClosedOK(None, None),
+        ]
+
+        async def connect_side_effect(*args, **kwargs):
+            return mock_websocket
+
+        mock_connect.side_effect = connect_side_effect
+
+        await client.connect()
 
         # Receive message
         received = []
@@ -116,3 +155,128 @@ async def test_adapter_client_receive_yields_messages_from_queue():
         assert len(received) == 1
         assert received[0].role == "assistant"
         assert received[0].content == "Hi"
+
+
+@pytest.mark.asyncio
+async def test_adapter_client_receive_stops_when_connection_closes():
+    """Test adapter client receive ends iteration once the server closes."""
+    client = AdapterClient("ws://localhost:8000/ws/agent")
+
+    with patch("adapter.client.websockets.connect") as mock_connect:
+        mock_websocket = AsyncMock()
+        mock_websocket.recv.side_effect = [
+            "not json",
+            ChatMessage(role="assistant", content="Bye").model_dump_json(),
+            websockets.ConnectionClosedOK(None, None),
+        ]
+
+        async def connect_side_effect(*args, **kwargs):
+            return mock_websocket
+
+        mock_connect.side_effect = connect_side_effect
+
+        await client.connect()
+
+        received = [msg async for msg in client.receive()]
+
+        assert [msg.content for msg in received] == ["Bye"]
+
+
+@pytest.mark.asyncio
+async def test_adapter_client_receive_resumes_batched_frame_after_break():
+    """Test messages left in a batched frame are yielded by the next receive."""
+    client = AdapterClient("ws://localhost:8000/ws/agent")
+    first = ChatMessage(role="user", content="first")
+    second = ChatMessage(role="user", content="second")
+    frame = encode_frame([encode_message(first), encode_message(second)])
+
+    with patch("adapter.client.websockets.connect") as mock_connect:
+        mock_websocket = AsyncMock()
+        mock_websocket.recv.side_effect = [
+            frame,
+            websockets.ConnectionClosedOK(None, None),
+        ]
+
+        async def connect_side_effect(*args, **kwargs):
+            return mock_websocket
+
+        mock_connect.side_effect = connect_side_effect
+
+        await client.connect()
+
+        async for msg in client.receive():
+            first_received = msg
+            break
+        async for msg in client.receive():
+            second_received = msg
+            break
+
+        assert first_received.content == "first"
+        assert second_received.content == "second"
+
+
+@pytest.mark.asyncio
+async def test_adapter_client_receive_yields_each_message_of_batched_frame():
+    """Test adapter client unpacks a batched frame into separate messages."""
+    client = AdapterClient("ws://localhost:8000/ws/agent")
+    first = ChatMessage(role="assistant", content="Hello", event_type="chunk")
+    second = ChatMessage(role="assistant", content="!", event_type="chunk")
+    frame = encode_frame([encode_message(first), encode_message(second)])
+
+    with patch("adapter.client.websockets.connect") as mock_connect:
+        mock_websocket = AsyncMock()
+        mock_websocket.recv.side_effect = [
+            frame,
+            websockets.ConnectionClosedOK(None, None),
+        ]
+
+        async def connect_side_effect(*args, **kwargs):
+            return mock_websocket
+
+        mock_connect.side_effect = connect_side_effect
+
+        await client.connect()
+
+        received = []
+        async for msg in client.receive():
+            received.append(msg)
+            if len(received) >= 2:
+                break
+
+        assert [msg.content for msg in received] == ["Hello", "!"]
+
+
+@pytest.mark.asyncio
+async def test_adapter_client_keeps_connection_alive_without_reader():
+    """Test unread frames do not stop the client from answering pings."""
+    frame_count = 200
+    pong_received = asyncio.Event()
+    sent_back = []
+
+    async def handler(websocket):
+        for i in range(frame_count):
+            await websocket.send(
+                encode_message(ChatMessage(role="assistant", content=str(i)))
+            )
+        # A client that stopped reading the socket never answers this
+        pong = await websocket.ping()
+        await asyncio.wait_for(pong, timeout=2.0)
+        pong_received.set()
+        sent_back.append(await websocket.recv())
+
+    async with serve(handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        client = AdapterClient(f"ws://127.0.0.1:{port}")
+        await client.connect()
+
+        await asyncio.wait_for(pong_received.wait(), timeout=5.0)
+        await client.send(ChatMessage(role="user", content="still here"))
+        received = []
+        async for message in client.receive():
+            received.append(message.content)
+            if len(received) == frame_count:
+                break
+        await client.disconnect()
+
+    assert received == [str(i) for i in range(frame_count)]
+    assert decode_frame(sent_back[0])[0].content == "still here"
@@ -1,5 +1,7 @@
 """Tests for connection manager module."""
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
@@ -31,6 +33,39 @@ async def test_connection_manager_disconnect_removes_websocket_from_active_conne
     assert len(manager.active_connections) == 0
 
 
+@pytest.mark.asyncio
+async def test_connection_manager_disconnect_ignores_unknown_websocket():
+    """Test disconnecting a websocket twice leaves other connections intact."""
+    manager = ConnectionManager()
+    kept_websocket = AsyncMock()
+    removed_websocket = AsyncMock()
+
+    await manager.connect(kept_websocket)
+    await manager.connect(removed_websocket)
+    manager.disconnect(removed_websocket)
+    manager.disconnect(removed_websocket)
+    await manager.broadcast("still here")
+
+    assert manager.active_connections == {kept_websocket}
+    kept_websocket.send_text.assert_called_once_with("still here")
+
+
+@pytest.mark.asyncio
+async def test_connection_manager_broadcast_skips_disconnected_websocket():
+    """Test broadcast no longer reaches a websocket after it disconnects."""
+    manager = ConnectionManager()
+    kept_websocket = AsyncMock()
+    removed_websocket = AsyncMock()
+
+    await manager.connect(kept_websocket)
+    await manager.connect(removed_websocket)
+    manager.disconnect(removed_websocket)
+    await manager.broadcast("after disconnect")
+
+    kept_websocket.send_text.assert_called_once_with("after disconnect")
+    removed_websocket.send_text.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_connection_manager_send_personal_message_sends_to_specific_websocket():
     """Test connection manager send_personal_message sends to specific websocket."""
@@ -81,23 +116,99 @@ async def test_connection_manager_broadcast_removes_failed_connections():
 
 
 @pytest.mark.asyncio
-async def test_connection_manager_receive_messages_yields_messages_from_websocket():
-    """Test connection manager receive_messages yields messages from websocket."""
+async def test_connection_manager_broadcast_removes_single_failing_connection():
+    """Test broadcast to a single failing connection disconnects it."""
     manager = ConnectionManager()
     mock_websocket = AsyncMock()
+    mock_websocket.send_text.side_effect = Exception("Connection failed")
+
+    await manager.connect(mock_websocket)
+    await manager.broadcast("test message")
 
-    # Setup mock to yield messages then raise exception
-    messages = ["message1", "message2"]
+    assert mock_websocket not in manager.active_connections
 
-    async def receive_text():
-        if messages:
-            return messages.pop(0)
-        raise Exception("Connection closed")
 
-    mock_websocket.receive_text = receive_text
+@pytest.mark.asyncio
+async def test_connection_manager_broadcast_bytes_sends_to_all_connections():
+    """Test broadcast_bytes sends the payload to every connection."""
+    manager = ConnectionManager()
+    mock_websocket1 = AsyncMock()
+    mock_websocket2 = AsyncMock()
+
+    await manager.connect(mock_websocket1)
+    await manager.connect(mock_websocket2)
+
+    await manager.broadcast_bytes(b"payload")
+
+    mock_websocket1.send_bytes.assert_called_once_with(b"payload")
+    mock_websocket2.send_bytes.assert_called_once_with(b"payload")
+
+
+@pytest.mark.asyncio
+async def test_connection_manager_receive_messages_yields_messages_from_websocket():
+    """Test connection manager receive_messages yields messages from websocket."""
+    manager = ConnectionManager()
+    mock_websocket = AsyncMock()
+
+    # Setup mock to yield text and binary frames, then disconnect
+    mock_websocket.receive.side_effect = [
+        {"type": "websocket.receive", "text": "message1"},
+        {"type": "websocket.receive", "bytes": b"message2"},
+        {"type": "websocket.disconnect", "code": 1000},
+    ]
 
     received = []
     async for message in manager.receive_messages(mock_websocket):
         received.append(message)
 
-    assert received == ["message1", "message2"]
+    assert received == ["message1", b"message2"]
+
+
+@pytest.mark.asyncio
+async def test_connection_manager_broadcast_drops_stalled_connection():
+    """Test broadcast drops a stalled connection and still reaches others."""
+    manager = ConnectionManager(send_timeout=0.05)
+    fast_websocket = AsyncMock()
+    slow_websocket = AsyncMock()
+
+    async def stalled_send(message):
+        await asyncio.sleep(10)
+
+    slow_websocket.send_text.side_effect = stalled_send
+
+    await manager.connect(slow_websocket)
+    await manager.connect(fast_websocket)
+
+    await asyncio.wait_for(manager.broadcast("test message"), timeout=1.0)
+
+    fast_websocket.send_text.assert_called_once_with("test message")
+    assert fast_websocket in manager.active_connections
+    assert slow_websocket not in manager.active_connections
+
+
+@pytest.mark.asyncio
+async def test_connection_manager_broadcast_overlaps_sends_to_all_connections():
+    """Test broadcast starts every send before any of them completes."""
+    manager = ConnectionManager()
+    websockets = [AsyncMock() for _ in range(5)]
+    all_started = asyncio.Event()
+    started = 0
+
+    async def blocking_send(message):
+        # Each send finishes only once all of them are in flight, so
+        # sequential sends would never get past the first one
+        nonlocal started
+        started += 1
+        if started == len(websockets):
+            all_started.set()
+        await all_started.wait()
+
+    for websocket in websockets:
+        websocket.send_text.side_effect = blocking_send
+        await manager.connect(websocket)
+
+    await asyncio.wait_for(manager.broadcast("test message"), timeout=1.0)
+
+    for websocket in websockets:
+        websocket.send_text.assert_called_once_with("test message")
+        assert websocket in manager.active_connections
@@ -1,9 +1,12 @@
 """Tests for server module."""
 
 import pytest
+from fastapi.testclient import TestClient
 
 from adapter.bridge import Bridge
 from adapter.server import create_app
+from protocol.codec import decode_frame, encode_frame, encode_message
+from protocol.models import ChatMessage
 
 
 def test_create_app_without_bridge():
@@ -21,3 +24,79 @@ def test_create_app_with_bridge():
 
     assert app is not None
     assert app.title == "Prior Adapter"
+
+
+def test_server_forwards_tui_message_to_agent_connection():
+    """Test message sent on TUI endpoint is delivered to agent endpoint."""
+    app = create_app()
+
+    with TestClient(app) as client:
+        with (
+            client.websocket_connect("/ws/agent") as agent_ws,
+            client.websocket_connect("/ws/tui") as tui_ws,
+        ):
+            message = ChatMessage(role="user", content="Hello agent")
+            tui_ws.send_text(message.model_dump_json())
+
+            received = ChatMessage.model_validate_json(agent_ws.receive_bytes())
+
+    assert received.role == "user"
+    assert received.content == "Hello agent"
+
+
+def test_server_ignores_invalid_frames_and_keeps_forwarding():
+    """Test server skips frames that fail validation and stays connected."""
+    app = create_app()
+
+    with TestClient(app) as client:
+        with (
+            client.websocket_connect("/ws/agent") as agent_ws,
+            client.websocket_connect("/ws/tui") as tui_ws,
+        ):
+            tui_ws.send_text("not json")
+            tui_ws.send_text('{"role": "robot", "content": "x"}')
+            message = ChatMessage(role="user", content="Still here")
+            tui_ws.send_text(message.model_dump_json())
+
+            received = ChatMessage.model_validate_json(agent_ws.receive_bytes())
+
+    assert received.content == "Still here"
+
+
+def test_server_accepts_binary_frames_from_clients():
+    """Test server decodes messages sent as binary frames."""
+    app = create_app()
+
+    with TestClient(app) as client:
+        with (
+            client.websocket_connect("/ws/tui") as tui_ws,
+            client.websocket_connect("/ws/agent") as agent_ws,
+        ):
+            message = ChatMessage(role="assistant", content="Binary")
+            agent_ws.send_bytes(message.model_dump_json().encode())
+
+            received = ChatMessage.model_validate_json(tui_ws.receive_bytes())
+
+    assert received.content == "Binary"
+
+
+def test_server_forwards_each_message_of_batched_client_frame():
+    """Test server unpacks a batched frame sent by a client."""
+    app = create_app()
+    first = ChatMessage(role="assistant", content="Hello")
+    second = ChatMessage(role="assistant", content="World")
+
+    with TestClient(app) as client:
+        with (
+            client.websocket_connect("/ws/tui") as tui_ws,
+            client.websocket_connect("/ws/agent") as agent_ws,
+        ):
+            agent_ws.send_bytes(
+                encode_frame([encode_message(first), encode_message(second)])
+            )
+
+            received = []
+            while len(received) < 2:
+                received.extend(decode_frame(tui_ws.receive_bytes()))
+
+    assert [msg.content for msg in received] == ["Hello", "World"]
@@ -1,16 +1,122 @@
 """Simple LLM agent wrapper using LiteLLM."""
 
+import asyncio
+import itertools
 import uuid
 from collections.abc import AsyncIterator
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
-from litellm import acompletion
+from litellm import acompletion, get_llm_provider
 
 from protocol.models import ChatMessage
 
 if TYPE_CHECKING:
     from adapter import AdapterClient
 
+# Maximum number of messages waiting for the adapter before streaming
+# pauses to let it catch up
+_SEND_QUEUE_SIZE = 64
+
+# Factor by which the chunk batch size grows after each adapter send
+_BATCH_GROWTH_FACTOR = 2
+
+
+@lru_cache(maxsize=8)
+def _system_prompt(project_context: str) -> str:
+    """
+    Build the system prompt for a project context.
+
+    Cached because a chat session sends the same project tree with every
+    turn.
+
+    Args:
+        project_context: Project file tree context
+
+    Returns:
+        System prompt text
+    """
+    return (
+        f"You are a coding assistant. "
+        f"Here is the project structure:\n\n"
+        f"{project_context}\n\n"
+        f"You can answer questions about the project "
+        f"structure and help with coding tasks."
+    )
+
+
+@lru_cache(maxsize=8)
+def _uses_cache_control(model: str) -> bool:
+    """
+    Check whether a model's provider takes Anthropic-style cache_control.
+
+    Args:
+        model: LiteLLM model name
+
+    Returns:
+        True if the system prompt can be marked for prompt caching
+    """
+    try:
+        provider = get_llm_provider(model)[1]
+    except Exception:
+        # Unknown to LiteLLM; send the prompt without cache hints
+        return False
+    return provider == "anthropic"
+
+
+def _system_message(project_context: str, model: str) -> dict[str, Any]:
+    """
+    Build the system message for a project context.
+
+    For Anthropic models the prompt is marked with cache_control, so the
+    provider can reuse the processed prefix across turns instead of
+    reading the same project tree again.
+
+    Args:
+        project_context: Project file tree context
+        model: LiteLLM model name the message is sent to
+
+    Returns:
+        System message dict
+    """
+    prompt = _system_prompt(project_context)
+    if not _uses_cache_control(model):
+        return {"role": "system", "content": prompt}
+    return {
+        "role": "system",
+        "content": [
+            {
+                "type": "text",
+                "text": prompt,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ],
+    }
+
+
+async def _forward_messages(
+    adapter: "AdapterClient", queue: "asyncio.Queue[ChatMessage | None]"
+) -> None:
+    """
+    Send queued messages through the adapter until a None arrives.
+
+    After a failed send the remaining messages are still taken off the
+    queue, so the producer never blocks; the error is raised at the end.
+
+    Args:
+        adapter: Adapter client to send messages with
+        queue: Messages to send, terminated by None
+    """
+    error: Exception | None = None
+    while (message := await queue.get()) is not None:
+        if error is None:
+            try:
+                await adapter.send(message)
+            except Exception as exc:
+                error = exc
+    if error is not None:
+        raise error
+
 
 class Agent:
     """Thin wrapper around LiteLLM for streaming chat."""
@@ -19,6 +125,8 @@ class Agent:
         self,
         model: str = "claude-sonnet-4-5",
         adapter: "AdapterClient | None" = None,
+        max_batch_size: int = 8,
+        batch_wait_timeout: float = 0.05,
     ):
         """
         Initialize agent.
@@ -26,43 +134,56 @@ class Agent:
         Args:
             model: Model name to use (default: claude-sonnet-4-5)
             adapter: Optional adapter client for sending messages
+            max_batch_size: Maximum number of response chunks combined
+                into one adapter message (default: 8)
+            batch_wait_timeout: Seconds after which pending chunks are
+                sent with the next chunk even if the batch is not full
+                (default: 0.05)
         """
         self.model = model
         self.adapter = adapter
+        self.max_batch_size = max_batch_size
+        self.batch_wait_timeout = batch_wait_timeout
+        # Response message IDs: a random per-agent prefix plus a counter
+        self._message_id_prefix = uuid.uuid4().hex[:12]
+        self._message_numbers = itertools.count(1)
 
     async def chat_stream(
-        self, messages: list[dict[str, Any]], project_context: str = ""
+        self,
+        messages: list[dict[str, Any]],
+        project_context: str = "",
+        adapter: "AdapterClient | None" = None,
     ) -> AsyncIterator[str]:
         """
         Stream chat responses from LLM.
 
+        Messages for the adapter are handed to a sender task, so chunks are
+        yielded without waiting for the adapter; the stream only ends once
+        every message has been sent. Chunks are sent to the adapter in
+        batches: the first chunk goes out alone, then the batch size
+        doubles up to max_batch_size. A smaller batch goes out with the
+        next chunk once batch_wait_timeout has passed since the previous
+        one; the timeout is only checked as chunks arrive.
+
         Args:
             messages: List of message dicts with 'role' and 'content' keys
             project_context: Optional project file tree context to include
+            adapter: Adapter client to send messages with for this call;
+                defaults to the agent's adapter
 
         Yields:
             Chunks of response text as they arrive
         """
         # Prepare messages with project context as system message if provided
-        system_messages = []
         if project_context:
-            system_messages.append(
-                {
-                    "role": "system",
-                    "content": (
-                        f"You are a coding assistant. "
-                        f"Here is the project structure:\n\n"
-                        f"{project_context}\n\n"
-                        f"You can answer questions about the project "
-                        f"structure and help with coding tasks."
-                    ),
-                }
-            )
-
-        all_messages = system_messages + messages
+            system_message = _system_message(project_context, self.model)
+            all_messages = [system_message, *messages]
+        else:
+            # Nothing to prepend; hand the caller's list over without a copy
+            all_messages = messages
 
         # Generate unique message ID for this response
-        message_id = str(uuid.uuid4())
+        message_id = f"{self._message_id_prefix}-{next(self._message_numbers)}"
 
         # Call LiteLLM with streaming
         response = await acompletion(
@@ -71,30 +192,80 @@ class Agent:
             stream=True,
         )
 
-        # Stream response chunks
-        response_content = ""
-        async for chunk in response:
-            if chunk.choices and len(chunk.choices) > 0:
-                delta = chunk.choices[0].delta
-                if delta and delta.content:
-                    response_content += delta.content
-                    # Send chunk via adapter if available
-                    if self.adapter:
+        # Forward messages to the adapter from a separate task
+        if adapter is None:
+            adapter = self.adapter
+        sender: asyncio.Task[None] | None = None
+        # Bound once so the per-chunk path does no attribute lookups
+        put = None
+        if adapter:
+            queue: asyncio.Queue[ChatMessage | None] = asyncio.Queue(
+                maxsize=_SEND_QUEUE_SIZE
+            )
+            sender = asyncio.create_task(_forward_messages(adapter, queue))
+            put = queue.put
+
+        # Chunks waiting for the adapter; sent once batch_size have collected
+        clock = asyncio.get_running_loop().time
+        batch: list[str] = []
+        batch_size = 1
+        last_flush = clock()
+
+        try:
+            # Stream response chunks, joined once at the end
+            parts: list[str] = []
+            async for chunk in response:
+                choices = chunk.choices
+                if not choices:
+                    continue
+                delta = choices[0].delta
+                content = delta.content if delta else None
+                if not content:
+                    continue
+                parts.append(content)
+                # Send batched chunks via adapter if available
+                if put is not None:
+                    batch.append(content)
+                    if (
+                        len(batch) >= batch_size
+                        or clock() - last_flush >= self.batch_wait_timeout
+                    ):
                         chat_message = ChatMessage(
                             role="assistant",
-                            content=delta.content,
+                            content="".join(batch),
                             event_type="chunk",
                             message_id=message_id,
                         )
-                        await self.adapter.send(chat_message)
-                    yield delta.content
-
-        # Send complete message after streaming is done
-        if self.adapter and response_content:
-            complete_message = ChatMessage(
-                role="assistant",
-                content=response_content,
-                event_type="message",
-                message_id=message_id,
-            )
-            await self.adapter.send(complete_message)
+                        await put(chat_message)
+                        batch = []
+                        batch_size = min(
+                            batch_size * _BATCH_GROWTH_FACTOR,
+                            self.max_batch_size,
+                        )
+                        last_flush = clock()
+                yield content
+
+            if put is not None:
+                if batch:
+                    chat_message = ChatMessage(
+                        role="assistant",
+                        content="".join(batch),
+                        event_type="chunk",
+                        message_id=message_id,
+                    )
+                    await put(chat_message)
+                # Send complete message after streaming is done
+                if parts:
+                    complete_message = ChatMessage(
+                        role="assistant",
+                        content="".join(parts),
+                        event_type="message",
+                        message_id=message_id,
+                    )
+                    await put(complete_message)
+                await put(None)
+                await sender
+        finally:
+            # Stream abandoned or failed; drop messages not yet sent
+            if sender is not None and not sender.done():
+                sender.cancel()
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from protocol.models import ChatMessage
-from tools.filetree import get_project_tree
+from tools.filetree import get_cached_project_tree
 from typing import TYPE_CHECKING
 
 from workflow import BaseNode, End, Graph, GraphRunContext
@@ -16,7 +18,7 @@ if TYPE_CHECKING:
     from agent import Agent
 
 
-@dataclass
+@dataclass(slots=True)
 class ProjectState:
     """State for project analysis workflow."""
 
@@ -24,7 +26,7 @@ class ProjectState:
     analysis: dict | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GetProjectTree(BaseNode[ProjectState, None, dict]):
     """Node that gets project tree structure."""
 
@@ -42,12 +44,15 @@ class GetProjectTree(BaseNode[ProjectState, None, dict]):
         Returns:
             Next node to execute
         """
-        tree = get_project_tree(self.project_root)
+        # The walk is blocking I/O; keep it off the event loop
+        tree = await asyncio.to_thread(
+            get_cached_project_tree, self.project_root
+        )
         ctx.state.project_tree = tree
         return AnalyzeProject()
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalyzeProject(BaseNode[ProjectState, None, dict]):
     """Node that analyzes project structure."""
 
@@ -64,14 +69,18 @@ class AnalyzeProject(BaseNode[ProjectState, None, dict]):
             End node with analysis results
         """
         tree = ctx.state.project_tree
-        # Simple analysis: count lines and files
-        lines = tree.split("\n")
-        file_count = sum(
-            1 for line in lines if "└──" in line or "├──" in line
-        )
+        if not tree:
+            # No project tree (e.g. no project root): nothing to count
+            analysis = {"total_lines": 0, "file_count": 0, "tree": ""}
+            ctx.state.analysis = analysis
+            return End(analysis)
+
+        # Simple analysis: count lines and files, scanning the tree in C
+        # without splitting it into a list of lines
+        file_count = tree.count("├──") + tree.count("└──")
 
         analysis = {
-            "total_lines": len(lines),
+            "total_lines": tree.count("\n") + 1,
             "file_count": file_count,
             "tree": tree,
         }
@@ -79,39 +88,47 @@ class AnalyzeProject(BaseNode[ProjectState, None, dict]):
         return End(analysis)
 
 
+# Graphs keep per-run data in GraphRun, so a single instance of each
+# workflow is shared by every run instead of being rebuilt per call
+_PROJECT_ANALYSIS_GRAPH: Graph[ProjectState, None, dict] = Graph(
+    nodes=(GetProjectTree, AnalyzeProject)
+)
+
+
 def create_project_analysis_workflow() -> Graph[ProjectState, None, dict]:
     """
     Create a workflow for analyzing project structure.
 
     Returns:
-        Configured workflow graph
+        Configured workflow graph, shared between callers
     """
-    return Graph(nodes=(GetProjectTree, AnalyzeProject))
+    return _PROJECT_ANALYSIS_GRAPH
 
 
-@dataclass
+@dataclass(slots=True)
 class ChatState:
     """State for chat workflow."""
 
-    message_history: list[dict[str, str]] = None
+    message_history: deque[dict[str, str]] = field(default_factory=deque)
     current_message: ChatMessage | None = None
     project_context: str = ""
 
-    def __post_init__(self):
-        """Initialize message_history if None."""
-        if self.message_history is None:
-            self.message_history = []
-
 
-@dataclass
+@dataclass(slots=True)
 class ChatDeps:
     """Dependencies for chat workflow."""
 
     agent: "Agent"
     project_root: Path | None = None
+    # Optional background load of the project tree, started before the
+    # first message arrives; used instead of walking project_root
+    project_tree_task: asyncio.Task[str] | None = None
+    # Maximum number of history messages kept and sent to the model; the
+    # oldest are dropped first. None keeps the whole session.
+    max_history: int | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ReceiveMessage(BaseNode[ChatState, ChatDeps, None]):
     """Node that receives user messages from adapter."""
 
@@ -127,7 +144,7 @@ class ReceiveMessage(BaseNode[ChatState, ChatDeps, None]):
         Returns:
             Next node to execute
         """
-        if not ctx.adapter:
+        if ctx.adapter is None:
             # No adapter, skip processing
             return End(None)
 
@@ -135,17 +152,26 @@ class ReceiveMessage(BaseNode[ChatState, ChatDeps, None]):
         async for message in ctx.adapter.receive():
             if message.role == "user":
                 ctx.state.current_message = message
+                history = ctx.state.message_history
+                max_history = ctx.deps.max_history if ctx.deps else None
+                if (
+                    not isinstance(history, deque)
+                    or history.maxlen != max_history
+                ):
+                    # Apply the configured cap once (and turn a plain list
+                    # into a deque); from then on every append drops the
+                    # oldest entry when the deque is full
+                    history = deque(history, maxlen=max_history)
+                    ctx.state.message_history = history
                 # Add to history
-                ctx.state.message_history.append(
-                    {"role": "user", "content": message.content}
-                )
+                history.append({"role": "user", "content": message.content})
                 return ProcessChat()
 
         # Should not reach here, but return End if no message
         return End(None)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessChat(BaseNode[ChatState, ChatDeps, None]):
     """Node that processes chat with agent."""
 
@@ -161,60 +187,67 @@ class ProcessChat(BaseNode[ChatState, ChatDeps, None]):
         Returns:
             Next node to execute
         """
-        if not ctx.deps or not ctx.deps.agent:
+        if ctx.deps is None or ctx.deps.agent is None:
             return End(None)
 
-        if not ctx.state.current_message:
+        if ctx.state.current_message is None:
             return End(None)
 
-        # Get project context if available
+        # Project context is static for a session: read the tree on the
+        # first turn and keep it in the state for the following ones
         project_context = ctx.state.project_context
-        if not project_context and ctx.deps.project_root:
-            from tools.filetree import get_project_tree
-
-            project_context = get_project_tree(ctx.deps.project_root)
-
-        # Convert message history to format expected by agent
-        messages = [
-            {"role": msg["role"], "content": msg["content"]}
-            for msg in ctx.state.message_history
-        ]
-
-        # Call agent to generate response
-        # Agent will send response chunks via its adapter
-        # But we need to ensure adapter is set correctly
-        # Since agent's adapter might be different, we'll use ctx.adapter
-        # by temporarily setting it on the agent
-        original_adapter = ctx.deps.agent.adapter
-        if ctx.adapter:
-            ctx.deps.agent.adapter = ctx.adapter
-
-        try:
-            # Stream response from agent
-            response_content = ""
-            async for chunk in ctx.deps.agent.chat_stream(
-                messages, project_context=project_context
-            ):
-                response_content += chunk
-
-            # Add assistant response to history
-            if response_content:
-                ctx.state.message_history.append(
-                    {"role": "assistant", "content": response_content}
-                )
-        finally:
-            # Restore original adapter
-            ctx.deps.agent.adapter = original_adapter
+        if not project_context:
+            if ctx.deps.project_tree_task is not None:
+                try:
+                    project_context = await ctx.deps.project_tree_task
+                except Exception:
+                    # The background read failed; read the tree here
+                    # instead so the session keeps working
+                    project_context = ""
+            if not project_context and ctx.deps.project_root:
+                try:
+                    project_context = await asyncio.to_thread(
+                        get_cached_project_tree, ctx.deps.project_root
+                    )
+                except OSError:
+                    # Chat without project context; a later turn retries
+                    project_context = ""
+            ctx.state.project_context = project_context
+
+        # History entries already have the role/content shape the agent
+        # expects; only the outer container is copied into the list the
+        # model API takes, and its length is bounded by max_history
+        messages = list(ctx.state.message_history)
+
+        # Call agent to generate response. The agent sends response chunks
+        # through the workflow's adapter (or its own when there is none);
+        # the adapter is passed per call so a shared agent is never mutated
+        parts: list[str] = []
+        async for chunk in ctx.deps.agent.chat_stream(
+            messages, project_context=project_context, adapter=ctx.adapter
+        ):
+            parts.append(chunk)
+
+        # Add assistant response to history, joined once at the end
+        if parts:
+            ctx.state.message_history.append(
+                {"role": "assistant", "content": "".join(parts)}
+            )
 
         # Continue listening for more messages
         return ReceiveMessage()
 
 
+_CHAT_GRAPH: Graph[ChatState, ChatDeps, None] = Graph(
+    nodes=(ReceiveMessage, ProcessChat)
+)
+
+
 def create_chat_workflow() -> Graph[ChatState, ChatDeps, None]:
     """
     Create a workflow for processing chat messages.
 
     Returns:
-        Configured workflow graph
+        Configured workflow graph, shared between callers
     """
-    return Graph(nodes=(ReceiveMessage, ProcessChat))
+    return _CHAT_GRAPH
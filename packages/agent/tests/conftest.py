@@ -0,0 +1,91 @@
+"""Pytest configuration and fixtures for agent tests."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from unittest.mock import patch
+
+import pytest
+
+from protocol.models import ChatMessage
+
+
+@pytest.fixture
+def patched_acompletion():
+    """
+    Replace LiteLLM's acompletion as the agent module sees it.
+
+    Yields:
+        Mock standing in for acompletion; tests set its side_effect
+    """
+    with patch("agent.agent.acompletion") as mock_acompletion:
+        yield mock_acompletion
+
+
+@dataclass(slots=True)
+class _Delta:
+    """Streamed delta carrying response text."""
+
+    content: str | None
+
+
+@dataclass(slots=True)
+class _Choice:
+    """Single choice of a streamed chunk."""
+
+    delta: _Delta
+
+
+@dataclass(slots=True)
+class _StreamChunk:
+    """Plain stand-in for a LiteLLM streaming chunk."""
+
+    choices: list[_Choice]
+
+
+def _make_chunk(content: str | None) -> _StreamChunk:
+    """Build a streaming chunk whose first choice carries content."""
+    return _StreamChunk(choices=[_Choice(delta=_Delta(content=content))])
+
+
+@pytest.fixture
+def make_chunk():
+    """
+    Provide a factory for LiteLLM-style streaming chunks.
+
+    Returns:
+        Function building a chunk from its delta content
+    """
+    return _make_chunk
+
+
+class _RecordingAdapter:
+    """Adapter stand-in that records every sent message."""
+
+    def __init__(self, release: asyncio.Event | None = None):
+        """
+        Initialize the adapter.
+
+        Args:
+            release: Optional event each send waits for before recording
+        """
+        self.release = release
+        self.sent: list[ChatMessage] = []
+
+    async def send(self, message: ChatMessage) -> None:
+        """Record a message, once release is set if one was given."""
+        if self.release is not None:
+            await self.release.wait()
+        self.sent.append(message)
+
+
+@pytest.fixture
+def make_adapter():
+    """
+    Provide a factory for adapters that record sent messages.
+
+    Returns:
+        Function building a recording adapter
+    """
+    return _RecordingAdapter
@@ -1,6 +1,6 @@
 """Unit tests for Agent class."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
 
 import pytest
 
@@ -21,20 +21,15 @@ def test_agent_uses_default_model_when_no_model_specified():
 
 
 @pytest.mark.asyncio
-async def test_agent_chat_stream_yields_response_chunks():
+async def test_agent_chat_stream_yields_response_chunks(
+    patched_acompletion, make_chunk
+):
     """Test Agent chat_stream yields response chunks correctly."""
     agent = Agent(model="test-model")
 
     # Mock LiteLLM response
-    mock_chunk1 = MagicMock()
-    mock_chunk1.choices = [MagicMock()]
-    mock_chunk1.choices[0].delta = MagicMock()
-    mock_chunk1.choices[0].delta.content = "Hello"
-
-    mock_chunk2 = MagicMock()
-    mock_chunk2.choices = [MagicMock()]
-    mock_chunk2.choices[0].delta = MagicMock()
-    mock_chunk2.choices[0].delta.content = " World"
+    mock_chunk1 = make_chunk("Hello")
+    mock_chunk2 = make_chunk(" World")
 
     async def mock_acompletion(*args, **kwargs):
         async def gen():
@@ -43,26 +38,26 @@ async def test_agent_chat_stream_yields_response_chunks():
 
         return gen()
 
-    with patch("agent.agent.acompletion", side_effect=mock_acompletion):
-        messages = [{"role": "user", "content": "Test"}]
-        chunks = []
-        async for chunk in agent.chat_stream(messages):
-            chunks.append(chunk)
+    patched_acompletion.side_effect = mock_acompletion
+
+    messages = [{"role": "user", "content": "Test"}]
+    chunks = []
+    async for chunk in agent.chat_stream(messages):
+        chunks.append(chunk)
 
-        # Verify we received all chunks
-        assert len(chunks) == 2
-        assert "".join(chunks) == "Hello World"
+    # Verify we received all chunks
+    assert len(chunks) == 2
+    assert "".join(chunks) == "Hello World"
 
 
 @pytest.mark.asyncio
-async def test_agent_chat_stream_includes_project_context_in_system_message():
+async def test_agent_chat_stream_includes_project_context_in_system_message(
+    patched_acompletion, make_chunk
+):
     """Test Agent chat_stream includes project context as system message."""
     agent = Agent(model="test-model")
 
-    mock_chunk = MagicMock()
-    mock_chunk.choices = [MagicMock()]
-    mock_chunk.choices[0].delta = MagicMock()
-    mock_chunk.choices[0].delta.content = "Response"
+    mock_chunk = make_chunk("Response")
 
     async def mock_acompletion(*args, **kwargs):
         # Verify that system message with project context is included
@@ -76,34 +71,88 @@ async def test_agent_chat_stream_includes_project_context_in_system_message():
 
         return gen()
 
-    with patch("agent.agent.acompletion", side_effect=mock_acompletion):
-        messages = [{"role": "user", "content": "Test"}]
-        chunks = []
-        async for chunk in agent.chat_stream(
-            messages, project_context="test/context"
+    patched_acompletion.side_effect = mock_acompletion
+
+    messages = [{"role": "user", "content": "Test"}]
+    chunks = []
+    async for chunk in agent.chat_stream(
+        messages, project_context="test/context"
+    ):
+        chunks.append(chunk)
+
+    # Verify response was received
+    assert len(chunks) > 0
+    assert "Response" in chunks
+
+
+@pytest.mark.asyncio
+async def test_agent_chat_stream_leaves_caller_messages_unchanged(
+    patched_acompletion, make_chunk
+):
+    """Test chat_stream does not modify the history it is given."""
+    agent = Agent(model="test-model")
+    messages = [
+        {"role": "user", "content": "Hi"},
+        {"role": "assistant", "content": "Hello"},
+        {"role": "user", "content": "Test"},
+    ]
+    original = [dict(message) for message in messages]
+
+    mock_chunk = make_chunk("Response")
+
+    async def mock_acompletion(*args, **kwargs):
+        async def gen():
+            yield mock_chunk
+
+        return gen()
+
+    patched_acompletion.side_effect = mock_acompletion
+
+    for project_context in ("test/context", ""):
+        async for _chunk in agent.chat_stream(
+            messages, project_context=project_context
         ):
-            chunks.append(chunk)
+            pass
 
-        # Verify response was received
-        assert len(chunks) > 0
-        assert "Response" in chunks
+    assert messages == original
 
 
 @pytest.mark.asyncio
-async def test_agent_chat_stream_sends_chunks_via_adapter_with_event_type():
-    """Test Agent chat_stream sends chunks via adapter with event_type."""
-    mock_adapter = AsyncMock()
-    agent = Agent(model="test-model", adapter=mock_adapter)
+async def test_agent_chat_stream_sends_messages_as_is_without_project_context(
+    patched_acompletion,
+):
+    """Test Agent chat_stream adds no system message without context."""
+    agent = Agent(model="test-model")
+    messages = [{"role": "user", "content": "Test"}]
+    sent_messages = []
+
+    async def mock_acompletion(*args, **kwargs):
+        sent_messages.extend(kwargs["messages"])
+
+        async def gen():
+            return
+            yield
+
+        return gen()
+
+    patched_acompletion.side_effect = mock_acompletion
+
+    chunks = [chunk async for chunk in agent.chat_stream(messages)]
 
-    mock_chunk1 = MagicMock()
-    mock_chunk1.choices = [MagicMock()]
-    mock_chunk1.choices[0].delta = MagicMock()
-    mock_chunk1.choices[0].delta.content = "Hello"
+    assert chunks == []
+    assert sent_messages == [{"role": "user", "content": "Test"}]
 
-    mock_chunk2 = MagicMock()
-    mock_chunk2.choices = [MagicMock()]
-    mock_chunk2.choices[0].delta = MagicMock()
-    mock_chunk2.choices[0].delta.content = " World"
+
+@pytest.mark.asyncio
+async def test_agent_chat_stream_sends_chunks_via_adapter_with_event_type(
+    patched_acompletion, make_chunk, make_adapter
+):
+    """Test Agent chat_stream sends chunks via adapter with event_type."""
+    adapter = make_adapter()
+    agent = Agent(model="test-model", adapter=adapter)
+
+    mock_chunk1 = make_chunk("Hello")
+    mock_chunk2 = make_chunk(" World")
 
     async def mock_acompletion(*args, **kwargs):
         async def gen():
@@ -112,36 +161,243 @@ async def test_agent_chat_stream_sends_chunks_via_adapter_with_event_type():
 
         return gen()
 
-    with patch("agent.agent.acompletion", side_effect=mock_acompletion):
-        messages = [{"role": "user", "content": "Test"}]
-        chunks = []
-        async for chunk in agent.chat_stream(messages):
-            chunks.append(chunk)
-
-        # Verify chunks were sent via adapter with event_type="chunk"
-        assert (
-            mock_adapter.send.call_count == 3
-        )  # 2 chunks + 1 complete message
-
-        # Check chunk messages
-        chunk_calls = [
-            call
-            for call in mock_adapter.send.call_args_list
-            if call[0][0].event_type == "chunk"
-        ]
-        assert len(chunk_calls) == 2
-
-        # Verify all chunks have same message_id
-        message_ids = [call[0][0].message_id for call in chunk_calls]
-        assert len(set(message_ids)) == 1  # All same message_id
-
-        # Check complete message
-        complete_calls = [
-            call
-            for call in mock_adapter.send.call_args_list
-            if call[0][0].event_type == "message"
-        ]
-        assert len(complete_calls) == 1
-        complete_message = complete_calls[0][0][0]
-        assert complete_message.content == "Hello World"
-        assert complete_message.message_id == message_ids[0]
+    patched_acompletion.side_effect = mock_acompletion
+
+    messages = [{"role": "user", "content": "Test"}]
+    chunks = []
+    async for chunk in agent.chat_stream(messages):
+        chunks.append(chunk)
+
+    # Verify chunks were sent via adapter with event_type="chunk"
+    assert len(adapter.sent) == 3  # 2 chunks + 1 complete message
+
+    # Check chunk messages
+    chunk_messages = [m for m in adapter.sent if m.event_type == "chunk"]
+    assert len(chunk_messages) == 2
+
+    # Verify all chunks have same message_id
+    message_ids = [m.message_id for m in chunk_messages]
+    assert len(set(message_ids)) == 1  # All same message_id
+
+    # Check complete message
+    complete_messages = [m for m in adapter.sent if m.event_type == "message"]
+    assert len(complete_messages) == 1
+    complete_message = complete_messages[0]
+    assert complete_message.content == "Hello World"
+    assert complete_message.message_id == message_ids[0]
+
+
+@pytest.mark.asyncio
+async def test_agent_chat_stream_yields_chunks_while_adapter_send_is_pending(
+    patched_acompletion, make_chunk, make_adapter
+):
+    """Test a slow adapter does not hold back chunks yielded to the caller."""
+    release_send = asyncio.Event()
+    adapter = make_adapter(release=release_send)
+    agent = Agent(model="test-model", adapter=adapter)
+
+    mock_chunks = [make_chunk(content) for content in ("Hello", " World")]
+
+    async def mock_acompletion(*args, **kwargs):
+        async def gen():
+            for mock_chunk in mock_chunks:
+                yield mock_chunk
+
+        return gen()
+
+    patched_acompletion.side_effect = mock_acompletion
+
+    stream = agent.chat_stream([{"role": "user", "content": "Test"}])
+    first = await asyncio.wait_for(anext(stream), timeout=1.0)
+    second = await asyncio.wait_for(anext(stream), timeout=1.0)
+    assert adapter.sent == []
+
+    release_send.set()
+    rest = [chunk async for chunk in stream]
+
+    assert [first, second, *rest] == ["Hello", " World"]
+    assert [message.content for message in adapter.sent] == [
+        "Hello",
+        " World",
+        "Hello World",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_agent_chat_stream_uses_new_message_id_for_each_response(
+    patched_acompletion, make_chunk, make_adapter
+):
+    """Test each chat_stream response is sent with a distinct message_id."""
+    adapter = make_adapter()
+    agent = Agent(model="test-model", adapter=adapter)
+
+    mock_chunk = make_chunk("Hi")
+
+    async def mock_acompletion(*args, **kwargs):
+        async def gen():
+            yield mock_chunk
+
+        return gen()
+
+    patched_acompletion.side_effect = mock_acompletion
+
+    messages = [{"role": "user", "content": "Test"}]
+    for _ in range(2):
+        async for _chunk in agent.chat_stream(messages):
+            pass
+
+    message_ids = [
+        m.message_id for m in adapter.sent if m.event_type == "message"
+    ]
+    assert len(message_ids) == 2
+    assert message_ids[0] != message_ids[1]
+
+
+@pytest.mark.asyncio
+async def test_agent_chat_stream_sends_via_adapter_argument_without_mutation(
+    patched_acompletion, make_chunk, make_adapter
+):
+    """Test chat_stream sends through a passed adapter, not the agent's."""
+    agent_adapter = make_adapter()
+    call_adapter = make_adapter()
+    agent = Agent(model="test-model", adapter=agent_adapter)
+
+    mock_chunk = make_chunk("Hi")
+
+    async def mock_acompletion(*args, **kwargs):
+        async def gen():
+            yield mock_chunk
+
+        return gen()
+
+    patched_acompletion.side_effect = mock_acompletion
+
+    messages = [{"role": "user", "content": "Test"}]
+    async for _chunk in agent.chat_stream(messages, adapter=call_adapter):
+        pass
+
+    assert len(call_adapter.sent) == 2
+    assert agent_adapter.sent == []
+    assert agent.adapter is agent_adapter
+
+
+def _streaming_acompletion(chunks):
+    """Build an acompletion stand-in that streams the given chunks."""
+
+    async def mock_acompletion(*args, **kwargs):
+        async def gen():
+            for chunk in chunks:
+                yield chunk
+
+        return gen()
+
+    return mock_acompletion
+
+
+@pytest.mark.asyncio
+async def test_agent_chat_stream_batches_chunks_with_growing_batch_size(
+    patched_acompletion, make_chunk, make_adapter
+):
+    """Test chunks are sent in batches of 1, 2, 4... up to the maximum."""
+    adapter = make_adapter()
+    agent = Agent(
+        model="test-model",
+        adapter=adapter,
+        max_batch_size=4,
+        batch_wait_timeout=60.0,
+    )
+    contents = list("abcdefghijk")
+
+    patched_acompletion.side_effect = _streaming_acompletion(
+        [make_chunk(content) for content in contents]
+    )
+
+    messages = [{"role": "user", "content": "Test"}]
+    chunks = [chunk async for chunk in agent.chat_stream(messages)]
+
+    assert chunks == contents
+    sent = adapter.sent
+    assert [m.content for m in sent if m.event_type == "chunk"] == [
+        "a",
+        "bc",
+        "defg",
+        "hijk",
+    ]
+    assert sent[-1].event_type == "message"
+    assert sent[-1].content == "abcdefghijk"
+
+
+@pytest.mark.asyncio
+async def test_agent_chat_stream_sends_each_chunk_once_wait_timeout_passed(
+    patched_acompletion, make_chunk, make_adapter
+):
+    """Test a zero batch_wait_timeout sends every chunk on its own."""
+    adapter = make_adapter()
+    agent = Agent(model="test-model", adapter=adapter, batch_wait_timeout=0.0)
+    contents = ["Hello", " big", " World"]
+
+    patched_acompletion.side_effect = _streaming_acompletion(
+        [make_chunk(content) for content in contents]
+    )
+
+    messages = [{"role": "user", "content": "Test"}]
+    async for _chunk in agent.chat_stream(messages):
+        pass
+
+    sent = adapter.sent
+    assert [m.content for m in sent if m.event_type == "chunk"] == contents
+
+
+@pytest.mark.asyncio
+async def test_agent_chat_stream_marks_system_prompt_cacheable_for_anthropic(
+    patched_acompletion,
+):
+    """Test Anthropic models get the system prompt with cache_control."""
+    agent = Agent(model="claude-sonnet-4-5")
+    sent_messages = []
+
+    async def mock_acompletion(*args, **kwargs):
+        sent_messages.extend(kwargs["messages"])
+
+        async def gen():
+            return
+            yield
+
+        return gen()
+
+    patched_acompletion.side_effect = mock_acompletion
+
+    messages = [{"role": "user", "content": "Test"}]
+    async for _chunk in agent.chat_stream(
+        messages, project_context="test/context"
+    ):
+        pass
+
+    system_message = sent_messages[0]
+    assert system_message["role"] == "system"
+    [block] = system_message["content"]
+    assert "test/context" in block["text"]
+    assert block["cache_control"] == {"type": "ephemeral"}
+
+
+@pytest.mark.asyncio
+async def test_agent_chat_stream_relays_long_stream_in_order(
+    patched_acompletion, make_chunk, make_adapter
+):
+    """Test a long stream reaches caller and adapter complete and in order."""
+    adapter = make_adapter()
+    agent = Agent(model="test-model", adapter=adapter)
+    contents = [f"token{i} " for i in range(100)]
+
+    patched_acompletion.side_effect = _streaming_acompletion(
+        [make_chunk(content) for content in contents]
+    )
+
+    messages = [{"role": "user", "content": "Test"}]
+    chunks = [chunk async for chunk in agent.chat_stream(messages)]
+
+    assert chunks == contents
+    sent = adapter.sent
+    chunk_text = "".join(m.content for m in sent if m.event_type == "chunk")
+    assert chunk_text == "".join(contents)
+    assert sent[-1].content == "".join(contents)
@@ -1,7 +1,17 @@
 """Protocol definitions for agent-tui communication."""
 
+from .codec import (
+    decode_frame,
+    decode_message,
+    encode_frame,
+    encode_message,
+)
 from .models import ChatMessage
 
 __all__ = [
     "ChatMessage",
+    "decode_frame",
+    "decode_message",
+    "encode_frame",
+    "encode_message",
 ]
@@ -1,19 +1,23 @@
 """Pydantic models for chat messages."""
 
-from datetime import datetime
+import time
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ChatMessage(BaseModel):
     """Chat message model."""
 
+    # Messages are shared between subscribers and batches once sent, so
+    # they are immutable; use model_copy to derive a changed message
+    model_config = ConfigDict(frozen=True)
+
     role: Literal["user", "assistant", "system"]
     content: str
-    timestamp: float | None = Field(
-        default_factory=lambda: datetime.now().timestamp()
-    )
+    # Seconds since the epoch; time.time gives the same value as
+    # datetime.now().timestamp() without building a datetime per message
+    timestamp: float | None = Field(default_factory=time.time)
     event_type: Literal["chunk", "message"] = Field(
         default="message",
         description=(
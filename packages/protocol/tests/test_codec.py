@@ -0,0 +1,94 @@
+"""Tests for protocol codec."""
+
+import pytest
+from pydantic import ValidationError
+from pydantic_core import PydanticSerializationError
+
+from protocol.codec import (
+    decode_frame,
+    decode_message,
+    encode_frame,
+    encode_message,
+)
+from protocol.models import ChatMessage
+
+
+def test_encode_message_returns_json_bytes_readable_by_pydantic():
+    """Test encode_message output round-trips through model_validate_json."""
+    message = ChatMessage(
+        role="assistant",
+        content="Hello",
+        event_type="chunk",
+        message_id="msg-1",
+    )
+
+    data = encode_message(message)
+
+    assert isinstance(data, bytes)
+    assert ChatMessage.model_validate_json(data) == message
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        ChatMessage(role="user", content='héllo "q"\n\t 日本 😀'),
+        ChatMessage(role="system", content="\x00\x1f", timestamp=None),
+        ChatMessage(role="assistant", content="", timestamp=1.0),
+    ],
+)
+def test_encode_message_matches_pydantic_json(message):
+    """Test orjson and pydantic-core encode a message to the same bytes."""
+    orjson = pytest.importorskip("orjson")
+    pydantic_json = ChatMessage.__pydantic_serializer__.to_json(message)
+
+    assert orjson.dumps(message.__dict__) == pydantic_json
+    assert encode_message(message) == pydantic_json
+
+
+def test_encode_message_raises_pydantic_error_for_unserializable_field():
+    """Test encode_message reports bad values with pydantic's error."""
+    message = ChatMessage.model_construct(
+        role="user",
+        content=object(),
+        timestamp=None,
+        event_type="message",
+        message_id=None,
+    )
+
+    with pytest.raises(PydanticSerializationError):
+        encode_message(message)
+
+
+def test_decode_message_accepts_text_and_bytes():
+    """Test decode_message decodes both str and bytes payloads."""
+    message = ChatMessage(role="user", content="Hi")
+    text = message.model_dump_json()
+
+    assert decode_message(text) == message
+    assert decode_message(text.encode()) == message
+
+
+def test_decode_message_raises_validation_error_for_invalid_payload():
+    """Test decode_message raises ValidationError for invalid JSON."""
+    with pytest.raises(ValidationError):
+        decode_message(b"not json")
+
+
+def test_encode_frame_keeps_single_message_unwrapped():
+    """Test encode_frame sends a lone message as a plain JSON object."""
+    payload = encode_message(ChatMessage(role="user", content="Hi"))
+
+    assert encode_frame([payload]) == payload
+
+
+def test_decode_frame_returns_all_messages_from_batched_frame():
+    """Test decode_frame decodes both single and batched frames."""
+    first = ChatMessage(role="assistant", content="Hello")
+    second = ChatMessage(role="assistant", content=" World")
+
+    batched = encode_frame([encode_message(first), encode_message(second)])
+    single = encode_frame([encode_message(first)])
+
+    assert decode_frame(batched) == [first, second]
+    assert decode_frame(single) == [first]
+    assert decode_frame(single.decode()) == [first]
@@ -1,6 +1,7 @@
 """Tests for protocol models."""
 
 import pytest
+from pydantic import ValidationError
 
 from protocol.models import ChatMessage
 
@@ -102,3 +103,15 @@ def test_chat_message_with_event_type_serializes_correctly():
     parsed = ChatMessage.model_validate_json(json_str)
     assert parsed.event_type == "chunk"
     assert parsed.message_id == "msg-123"
+
+
+def test_chat_message_rejects_field_assignment():
+    """Test ChatMessage is frozen and model_copy derives changed messages."""
+    message = ChatMessage(role="assistant", content="Hello")
+
+    with pytest.raises(ValidationError):
+        message.content = "Changed"
+
+    changed = message.model_copy(update={"content": "Changed"})
+    assert changed.content == "Changed"
+    assert message.content == "Hello"
@@ -1,5 +1,5 @@
 """Agent tools and utilities."""
 
-from .filetree import get_project_tree
+from .filetree import get_cached_project_tree, get_project_tree
 
-__all__ = ["get_project_tree"]
+__all__ = ["get_cached_project_tree", "get_project_tree"]
@@ -1,26 +1,12 @@
 """Utility to read project file tree."""
 
+import os
+from functools import lru_cache
 from pathlib import Path
 
-
-def get_project_tree(root: Path | None = None, max_depth: int = 5) -> str:
-    """
-    Get project file tree as a string.
-
-    Args:
-        root: Root directory (default: current working directory)
-        max_depth: Maximum depth to traverse
-
-    Returns:
-        File tree as a formatted string
-    """
-    if root is None:
-        root = Path.cwd()
-
-    root = Path(root).resolve()
-
-    # Files/directories to ignore
-    ignore_patterns = {
+# Files/directories to ignore, matched against the full entry name
+_IGNORE_NAMES = frozenset(
+    {
         ".git",
         "__pycache__",
         ".pytest_cache",
@@ -31,66 +17,134 @@ def get_project_tree(root: Path | None = None, max_depth: int = 5) -> str:
         ".env",
         "node_modules",
         ".DS_Store",
-        "*.pyc",
-        "*.pyo",
         ".coverage",
         "htmlcov",
         ".tox",
         "dist",
         "build",
-        "*.egg-info",
     }
+)
 
-    def should_ignore(path: Path) -> bool:
-        """Check if path should be ignored."""
-        name = path.name
-        # Check exact matches
-        if name in ignore_patterns:
-            return True
-        # Check patterns
-        for pattern in ignore_patterns:
-            if pattern.startswith("*") and name.endswith(pattern[1:]):
-                return True
-        return False
-
-    def build_tree(
-        path: Path, prefix: str = "", is_last: bool = True, depth: int = 0
-    ) -> list[str]:
-        """Recursively build tree structure."""
-        if depth > max_depth:
-            return []
+# Files/directories to ignore by name suffix (the "*.pyc"-style patterns)
+_IGNORE_SUFFIXES = (".pyc", ".pyo", ".egg-info")
 
-        lines = []
-        if path != root:
-            connector = "└── " if is_last else "├── "
-            lines.append(f"{prefix}{connector}{path.name}")
 
-        if path.is_file() or depth >= max_depth:
-            return lines
+def _should_ignore(name: str) -> bool:
+    """Check if an entry name should be ignored."""
+    return name in _IGNORE_NAMES or name.endswith(_IGNORE_SUFFIXES)
 
-        # Get children
-        try:
-            children = sorted(
-                [p for p in path.iterdir() if not should_ignore(p)],
-                key=lambda p: (p.is_file(), p.name.lower()),
-            )
-        except PermissionError:
-            return lines
 
-        if not children:
-            return lines
+def get_project_tree(root: Path | None = None, max_depth: int = 5) -> str:
+    """
+    Get project file tree as a string.
+
+    Args:
+        root: Root directory (default: current working directory)
+        max_depth: Maximum depth to traverse
+
+    Returns:
+        File tree as a formatted string
+    """
+    if root is None:
+        root = Path.cwd()
+
+    root = Path(root).resolve()
 
-        new_prefix = prefix + ("    " if is_last else "│   ")
+    def list_children(path: str) -> list[os.DirEntry[str]]:
+        """Return the entries of a directory in display order."""
+        # scandir entries carry their file type from the directory listing,
+        # so sorting and descending need no extra stat call per entry
+        try:
+            with os.scandir(path) as entries:
+                return sorted(
+                    (
+                        entry
+                        for entry in entries
+                        if not _should_ignore(entry.name)
+                    ),
+                    key=lambda entry: (entry.is_file(), entry.name.lower()),
+                )
+        except PermissionError:
+            return []
 
-        for i, child in enumerate(children):
-            is_last_child = i == len(children) - 1
-            lines.extend(
-                build_tree(child, new_prefix, is_last_child, depth + 1)
-            )
+    # Entries still to print, each with its line prefix, whether it is the
+    # last of its siblings and its depth. Children are pushed in reverse so
+    # they pop in display order, right after their parent's line.
+    stack: list[tuple[os.DirEntry[str], str, bool, int]] = []
 
-        return lines
+    def push_children(path: str, prefix: str, depth: int) -> None:
+        """Queue the entries of a directory for printing."""
+        children = list_children(path)
+        last_index = len(children) - 1
+        for i in range(last_index, -1, -1):
+            stack.append((children[i], prefix, i == last_index, depth))
 
     tree_lines = [f"{root.name}/"]
-    tree_lines.extend(build_tree(root, "", True, 0))
+    if max_depth > 0:
+        # The root counts as a last entry, so its children are indented
+        push_children(str(root), "    ", 0)
+
+    while stack:
+        child, prefix, is_last, depth = stack.pop()
+        connector = "└── " if is_last else "├── "
+        tree_lines.append(f"{prefix}{connector}{child.name}")
+        if depth + 1 < max_depth and child.is_dir():
+            new_prefix = prefix + ("    " if is_last else "│   ")
+            push_children(child.path, new_prefix, depth + 1)
 
     return "\n".join(tree_lines)
+
+
+@lru_cache(maxsize=32)
+def _cached_project_tree(root: Path, max_depth: int, mtime_ns: int) -> str:
+    """Build the tree; mtime_ns only takes part in the cache key."""
+    return get_project_tree(root, max_depth)
+
+
+def _tree_mtime_ns(root: Path) -> int:
+    """Return the latest mtime of root and its direct subdirectories."""
+    # Like the tree walk, skip what cannot be read and fall back to the
+    # mtimes that can
+    try:
+        mtime_ns = root.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = 0
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    try:
+                        entry_mtime_ns = entry.stat(
+                            follow_symlinks=False
+                        ).st_mtime_ns
+                    except OSError:
+                        continue
+                    mtime_ns = max(mtime_ns, entry_mtime_ns)
+    except OSError:
+        pass
+    return mtime_ns
+
+
+def get_cached_project_tree(
+    root: Path | None = None, max_depth: int = 5
+) -> str:
+    """
+    Get project file tree, reusing the last result while it is current.
+
+    The tree is rebuilt when root or one of its direct subdirectories is
+    modified, i.e. when entries are added, removed or renamed there.
+    Changes only below that level are picked up once one of those
+    directories changes as well.
+
+    Args:
+        root: Root directory (default: current working directory)
+        max_depth: Maximum depth to traverse
+
+    Returns:
+        File tree as a formatted string
+    """
+    if root is None:
+        root = Path.cwd()
+
+    root = Path(root).resolve()
+    return _cached_project_tree(root, max_depth, _tree_mtime_ns(root))
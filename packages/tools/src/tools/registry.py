@@ -5,6 +5,9 @@ from typing import Any
 
 # Global tool registry
 _tools: dict[str, Callable[..., Any]] = {}
+# Snapshot of the registered names, refreshed on registration so reads
+# do not rebuild it
+_tool_names: tuple[str, ...] = ()
 
 
 def register_tool(name: str, func: Callable[..., Any]) -> None:
@@ -15,7 +18,9 @@ def register_tool(name: str, func: Callable[..., Any]) -> None:
         name: Tool name
         func: Tool function
     """
+    global _tool_names
     _tools[name] = func
+    _tool_names = tuple(_tools)
 
 
 def get_tool(name: str) -> Callable[..., Any] | None:
@@ -38,4 +43,14 @@ def list_tools() -> list[str]:
     Returns:
         List of tool names
     """
-    return list(_tools.keys())
+    return list(_tool_names)
+
+
+def tool_names() -> tuple[str, ...]:
+    """
+    Get the names of all registered tools without copying them.
+
+    Returns:
+        Tool names in registration order
+    """
+    return _tool_names
@@ -1,9 +1,10 @@
 """Unit tests for filetree utility."""
 
+import os
 import tempfile
 from pathlib import Path
 
-from tools.filetree import get_project_tree
+from tools.filetree import get_cached_project_tree, get_project_tree
 
 
 def test_get_project_tree_returns_tree_structure_with_all_files():
@@ -88,3 +89,85 @@ def test_get_project_tree_uses_current_directory_when_no_root_specified():
     # Should return a non-empty tree string
     assert isinstance(tree, str)
     assert len(tree) > 0
+
+
+def test_get_cached_project_tree_reuses_tree_until_directory_changes():
+    """Test get_cached_project_tree rebuilds only after a directory change."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        (root / "subdir").mkdir()
+        (root / "file1.py").write_text("# test")
+
+        first = get_cached_project_tree(root)
+        second = get_cached_project_tree(root)
+
+        (root / "subdir" / "file2.py").write_text("# test")
+        # Make the change visible regardless of timestamp granularity
+        mtime_ns = (root / "subdir").stat().st_mtime_ns + 1_000_000_000
+        os.utime(root / "subdir", ns=(mtime_ns, mtime_ns))
+
+        third = get_cached_project_tree(root)
+
+        assert second is first
+        assert "file2.py" not in first
+        assert "file2.py" in third
+
+
+def test_get_project_tree_lists_broken_symlink_without_descending(tmp_path):
+    """Test get_project_tree lists a dangling symlink as a plain entry."""
+    (tmp_path / "file.py").write_text("# test")
+    (tmp_path / "dangling").symlink_to(tmp_path / "missing")
+
+    tree = get_project_tree(tmp_path)
+
+    assert tree.splitlines() == [
+        f"{tmp_path.name}/",
+        "    ├── dangling",
+        "    └── file.py",
+    ]
+
+
+def test_get_project_tree_nests_entries_under_their_directory(tmp_path):
+    """Test get_project_tree prints each subtree right below its parent."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "inner").mkdir()
+    (tmp_path / "a" / "inner" / "deep.py").write_text("# test")
+    (tmp_path / "a" / "x.py").write_text("# test")
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "y.py").write_text("# test")
+    (tmp_path / "top.py").write_text("# test")
+
+    tree = get_project_tree(tmp_path)
+
+    assert tree.splitlines() == [
+        f"{tmp_path.name}/",
+        "    ├── a",
+        "    │   ├── inner",
+        "    │   │   └── deep.py",
+        "    │   └── x.py",
+        "    ├── b",
+        "    │   └── y.py",
+        "    └── top.py",
+    ]
+
+
+def test_get_project_tree_ignores_entries_by_suffix(tmp_path):
+    """Test get_project_tree skips compiled files and egg-info folders."""
+    (tmp_path / "module.py").write_text("# test")
+    (tmp_path / "module.pyc").write_bytes(b"")
+    (tmp_path / "pkg.egg-info").mkdir()
+
+    tree = get_project_tree(tmp_path)
+
+    assert tree.splitlines() == [f"{tmp_path.name}/", "    └── module.py"]
+
+
+def test_get_cached_project_tree_handles_unreadable_root(tmp_path, monkeypatch):
+    """Test get_cached_project_tree returns the tree for an unlistable root."""
+
+    def deny_scandir(path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(os, "scandir", deny_scandir)
+
+    assert get_cached_project_tree(tmp_path) == f"{tmp_path.name}/"
@@ -0,0 +1,22 @@
+"""Unit tests for tool registry."""
+
+from tools.registry import get_tool, list_tools, register_tool, tool_names
+
+
+def test_register_tool_updates_tool_names_snapshot():
+    """Test registering a tool adds it to tool_names and list_tools."""
+    before = tool_names()
+
+    def tool():
+        return "result"
+
+    register_tool("test_registry_tool", tool)
+
+    assert tool_names() == (*before, "test_registry_tool")
+    assert list_tools() == list(tool_names())
+    assert get_tool("test_registry_tool") is tool
+
+
+def test_tool_names_returns_same_snapshot_between_registrations():
+    """Test tool_names reuses its snapshot until a tool is registered."""
+    assert tool_names() is tool_names()
@@ -80,13 +80,20 @@ class ChatService:
                         del self._assistant_streams[message_id]
                     else:
                         final_content = message.content
-                    # Create complete message
-                    complete_message = ChatMessage(
-                        role="assistant",
-                        content=final_content,
-                        event_type="message",
-                        message_id=message_id,
-                    )
+                    # Reuse the decoded message when nothing changed;
+                    # otherwise copy it without re-running validation
+                    if (
+                        final_content is message.content
+                        and message_id == message.message_id
+                    ):
+                        complete_message = message
+                    else:
+                        complete_message = message.model_copy(
+                            update={
+                                "content": final_content,
+                                "message_id": message_id,
+                            }
+                        )
                     # Add to history
                     self.message_history.append(
                         {"role": "assistant", "content": final_content}
@@ -166,6 +166,41 @@ async def test_chat_service_receive_messages_yields_complete_message():
         pass
 
 
+@pytest.mark.asyncio
+async def test_chat_service_receive_messages_yields_unstreamed_message():
+    """Test ChatService yields a complete message that had no chunks as-is."""
+    mock_adapter = MockAdapter()
+    service = ChatService(adapter=mock_adapter)
+
+    complete = ChatMessage(
+        role="assistant",
+        content="Hello World",
+        event_type="message",
+        message_id="test-msg-789",
+        timestamp=123.0,
+    )
+
+    received_messages = []
+    receive_task = asyncio.create_task(
+        _collect_messages(service.receive_messages(), received_messages)
+    )
+
+    await mock_adapter.put_message(complete)
+    await asyncio.sleep(0.2)
+
+    assert len(received_messages) == 1
+    assert received_messages[0].content == "Hello World"
+    assert received_messages[0].message_id == "test-msg-789"
+    assert received_messages[0].timestamp == 123.0
+    assert service.message_history[0]["content"] == "Hello World"
+
+    receive_task.cancel()
+    try:
+        await receive_task
+    except asyncio.CancelledError:
+        pass
+
+
 @pytest.mark.asyncio
 async def test_chat_service_get_message_history_returns_copy():
     """Test ChatService get_message_history returns a copy of history."""
@@ -63,7 +63,8 @@ class WorkflowRunner(Generic[StateT, DepsT, RunEndT]):
         Args:
             graph: Workflow graph to execute
             start_node: Starting node for the workflow
-            state_factory: Factory function to create initial state
+            state_factory: Factory function returning the state for each
+                run, called again before every restart
             deps: Optional dependencies
             adapter: Optional adapter client for communication
             on_error: Optional error handler callback
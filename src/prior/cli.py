@@ -17,11 +17,29 @@ from agent.workflows import (
     create_chat_workflow,
 )
 from pathlib import Path
+from tools.filetree import get_cached_project_tree
 from tui.app import PriorApp
 from tui.chat_service import ChatService
 from workflow import WorkflowRunner
 
 
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Create the event loop that runs the adapter server and chat workflow.
+
+    Uses uvloop when it is installed (uvicorn[standard] ships it on
+    supported platforms) and falls back to the default asyncio loop.
+
+    Returns:
+        New event loop
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
+
+
 def find_available_port(
     host: str = "localhost", start_port: int = 8000, max_attempts: int = 100
 ) -> int:
@@ -75,8 +93,13 @@ async def start_adapter_server(
     bridge = Bridge()
     app = create_app(bridge)
 
+    # Clients are local and exchange small messages; skip compression
     config = uvicorn.Config(
-        app, host=host, port=actual_port, log_level="warning"
+        app,
+        host=host,
+        port=actual_port,
+        log_level="warning",
+        ws_per_message_deflate=False,
     )
     server = uvicorn.Server(config)
 
@@ -127,7 +150,7 @@ def main() -> None:
         return agent, tui_adapter, agent_adapter
 
     # Run setup in async context
-    loop = asyncio.new_event_loop()
+    loop = new_event_loop()
     asyncio.set_event_loop(loop)
     agent, tui_adapter, agent_adapter = loop.run_until_complete(
         setup_connections()
@@ -144,15 +167,22 @@ def main() -> None:
             return
 
         graph = create_chat_workflow()
-        deps = ChatDeps(agent=agent, project_root=project_root)
+        # Walk the project in a worker thread while waiting for the first
+        # message instead of when that message arrives
+        tree_task = asyncio.create_task(
+            asyncio.to_thread(get_cached_project_tree, project_root)
+        )
+        deps = ChatDeps(
+            agent=agent, project_root=project_root, project_tree_task=tree_task
+        )
 
-        def state_factory() -> ChatState:
-            """Create initial chat state with project context."""
-            state = ChatState()
-            if project_root:
-                from tools.filetree import get_project_tree
+        # One state for the whole session, so history and the project
+        # context ProcessChat stores on the first turn survive restarts
+        state = ChatState()
 
-                state.project_context = get_project_tree(project_root)
+        def state_factory() -> ChatState:
+            """Reuse the session state after an error, keeping history."""
+            state.current_message = None
             return state
 
         runner = WorkflowRunner()
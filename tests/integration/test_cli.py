@@ -6,7 +6,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from prior.cli import main
+from prior.cli import main, new_event_loop
 
 
 def test_cli_uses_model_from_environment_variable():
@@ -98,6 +98,18 @@ def test_cli_loads_dotenv_file_on_startup():
         mock_load_dotenv.assert_called_once()
 
 
+def test_new_event_loop_falls_back_to_asyncio_without_uvloop():
+    """Test new_event_loop returns a working asyncio loop without uvloop."""
+    with patch.dict("sys.modules", {"uvloop": None}):
+        loop = new_event_loop()
+
+    try:
+        assert isinstance(loop, asyncio.AbstractEventLoop)
+        assert loop.run_until_complete(asyncio.sleep(0, result=42)) == 42
+    finally:
+        loop.close()
+
+
 @pytest.mark.asyncio
 async def test_chat_workflow_processes_user_message_and_returns_agent_response():
     """Test chat workflow processes user message and returns agent response."""
@@ -115,7 +127,7 @@ async def test_chat_workflow_processes_user_message_and_returns_agent_response()
     # Create mock agent
     mock_agent = MagicMock(spec=Agent)
 
-    async def mock_chat_stream(messages, project_context=""):
+    async def mock_chat_stream(messages, project_context="", adapter=None):
         # Simulate streaming response
         yield "Hello"
         yield " from"
@@ -197,7 +209,7 @@ async def test_chat_workflow_message_flow_through_workflow():
     # Create mock agent
     mock_agent = MagicMock()
 
-    async def mock_chat_stream(messages, project_context=""):
+    async def mock_chat_stream(messages, project_context="", adapter=None):
         yield "Response"
 
     mock_agent.chat_stream = mock_chat_stream